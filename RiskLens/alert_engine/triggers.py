@@ -0,0 +1,245 @@
+# Incremental high-risk alert triggers over scored account streams
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+_META_FILE = "meta.json"
+
+
+class AccountStateStore:
+    """
+    Compact per-account last-state store: one float32 array per field,
+    indexed by slot, plus a sorted id index for vectorized lookups.
+
+    With `path` set the arrays are `.npy` memory maps in that directory, so
+    state persists between runs and opening a store does not read it into
+    RAM; capacity doubles (one file rewrite) when it fills up. Ids are int64
+    or fixed-width bytes (e.g. id_dtype="S10" for PANs). Missing values are
+    NaN.
+    """
+
+    def __init__(self, fields, path=None, id_dtype="int64", capacity=65536, _count=0):
+        self.fields = list(fields)
+        self.path = path
+        self.id_dtype = np.dtype(id_dtype)
+        self.capacity = capacity
+        self.count = _count
+        if path:
+            os.makedirs(path, exist_ok=True)
+        mode = "r+" if _count else "w+"
+        self.ids = self._array("ids", self.id_dtype, mode)
+        self.values = {f: self._array(f, np.float32, mode) for f in self.fields}
+        self._reindex()
+        self._write_meta()
+
+    @classmethod
+    def open(cls, path):
+        with open(os.path.join(path, _META_FILE)) as f:
+            meta = json.load(f)
+        return cls(meta["fields"], path, meta["id_dtype"], meta["capacity"], _count=meta["count"])
+
+    def __len__(self):
+        return self.count
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.npy")
+
+    def _array(self, name, dtype, mode="w+"):
+        if not self.path:
+            return np.full(self.capacity, np.nan, dtype) if dtype == np.float32 else np.zeros(self.capacity, dtype)
+        if mode == "r+":
+            return np.load(self._file(name), mmap_mode="r+")
+        arr = np.lib.format.open_memmap(self._file(name), mode="w+", dtype=dtype, shape=(self.capacity,))
+        if dtype == np.float32:
+            arr[:] = np.nan
+        return arr
+
+    def _write_meta(self):
+        if self.path:
+            meta = {"fields": self.fields, "id_dtype": self.id_dtype.str, "capacity": self.capacity, "count": self.count}
+            tmp = os.path.join(self.path, _META_FILE + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp, os.path.join(self.path, _META_FILE))
+
+    def _reindex(self):
+        ids = self.ids[:self.count]
+        self._order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[self._order]
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = {"ids": self.ids, **self.values}
+        self.capacity = capacity
+        grown = {}
+        for name, arr in old.items():
+            data = np.array(arr[:self.count])
+            if self.path:
+                os.remove(self._file(name))
+            new = self._array(name, data.dtype)
+            new[:self.count] = data
+            grown[name] = new
+        self.ids = grown.pop("ids")
+        self.values = grown
+
+    def lookup(self, ids):
+        """Slots of `ids` (-1 for accounts not in the store)."""
+        ids = np.asarray(ids, dtype=self.id_dtype)
+        if not self.count:
+            return np.full(len(ids), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self._sorted_ids, ids), self.count - 1)
+        return np.where(self._sorted_ids[pos] == ids, self._order[pos], -1)
+
+    def insert(self, ids):
+        """Adds new (unique, not yet stored) ids and returns their slots."""
+        ids = np.asarray(ids, dtype=self.id_dtype)
+        if self.count + len(ids) > self.capacity:
+            self._grow(self.count + len(ids))
+        slots = np.arange(self.count, self.count + len(ids))
+        self.ids[slots] = ids
+        self.count += len(ids)
+        # Merge the new ids into the sorted index: O(n + k log k), no full re-sort.
+        order = np.argsort(ids, kind="stable")
+        pos = np.searchsorted(self._sorted_ids, ids[order])
+        self._sorted_ids = np.insert(self._sorted_ids, pos, ids[order])
+        self._order = np.insert(self._order, pos, slots[order])
+        return slots
+
+    def get(self, slots):
+        """(len(slots) x n_fields) float32 state for the given slots."""
+        return np.column_stack([self.values[f][slots] for f in self.fields]) if len(self.fields) else None
+
+    def set(self, slots, state):
+        for j, f in enumerate(self.fields):
+            self.values[f][slots] = state[:, j]
+
+    def flush(self):
+        if self.path:
+            for arr in [self.ids, *self.values.values()]:
+                arr.flush()
+            self._write_meta()
+
+
+# --- Triggers ---
+class ScoreDrop:
+    """Score fell by more than `points` since the account's last state."""
+
+    def __init__(self, points=10, column="risk_score", name="score_drop"):
+        self.points = points
+        self.column = column
+        self.name = name
+        self.columns = [column]
+
+    def fire(self, prev, cur, known):
+        return known & (prev[self.column] - cur[self.column] > self.points)
+
+
+class NewFlag:
+    """A 0/1 flag (e.g. previous NPA) turned on; new accounts fire only with `include_new`."""
+
+    def __init__(self, column="ext_previous_npa", name="new_npa", include_new=False):
+        self.column = column
+        self.name = name
+        self.include_new = include_new
+        self.columns = [column]
+
+    def fire(self, prev, cur, known):
+        was_set = known & (prev[self.column] > 0)
+        return (cur[self.column] > 0) & ~was_set & (known | self.include_new)
+
+
+class ThresholdCross:
+    """A metric (e.g. EMI bounces) reached `threshold` from below (or first appears at/above it)."""
+
+    def __init__(self, column="beh_past_emi_bounces", threshold=3, name="emi_bounces"):
+        self.column = column
+        self.threshold = threshold
+        self.name = name
+        self.columns = [column]
+
+    def fire(self, prev, cur, known):
+        before = np.where(known, prev[self.column] >= self.threshold, False)
+        return (cur[self.column] >= self.threshold) & ~before
+
+
+DEFAULT_TRIGGERS = [ScoreDrop(10), NewFlag("ext_previous_npa"), ThresholdCross("beh_past_emi_bounces", 3)]
+
+
+class AlertEngine:
+    """
+    Evaluates triggers incrementally against each account's previous state.
+
+    `process(frame)` takes a batch of scored rows (`id_column` plus the
+    columns the triggers read), looks up the previous state of those
+    accounts only, evaluates the triggers on the rows whose state changed
+    (or are new), writes the new state back and returns the alerts. Every
+    step is a vectorized array operation, so the cost scales with the batch,
+    not the portfolio.
+    """
+
+    def __init__(self, triggers=None, store=None, path=None, id_column="account_id", id_dtype="int64"):
+        self.triggers = list(DEFAULT_TRIGGERS if triggers is None else triggers)
+        self.id_column = id_column
+        fields = list(dict.fromkeys(c for t in self.triggers for c in t.columns))
+        if store is None:
+            if path and os.path.exists(os.path.join(path, _META_FILE)):
+                store = AccountStateStore.open(path)
+            else:
+                store = AccountStateStore(fields, path, id_dtype)
+        missing = set(fields) - set(store.fields)
+        if missing:
+            raise ValueError(f"State store lacks fields required by the triggers: {sorted(missing)}")
+        self.store = store
+        self.rows_seen = 0
+        self.rows_changed = 0
+
+    def process(self, frame):
+        store = self.store
+        # Last update wins when an account appears more than once in the batch.
+        frame = frame.loc[~frame[self.id_column].duplicated(keep="last").to_numpy()]
+        ids = frame[self.id_column].to_numpy().astype(store.id_dtype)
+        cur = np.column_stack([
+            pd.to_numeric(frame[f], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+            if f in frame else np.full(len(frame), np.nan, np.float32)
+            for f in store.fields
+        ])
+
+        slots = store.lookup(ids)
+        known = slots >= 0
+        prev = np.full_like(cur, np.nan)
+        prev[known] = store.get(slots[known])
+        same = (prev == cur) | (np.isnan(prev) & np.isnan(cur))
+        changed = ~known | ~same.all(axis=1)
+        self.rows_seen += len(frame)
+        self.rows_changed += int(changed.sum())
+
+        ids, cur, prev, known, slots = ids[changed], cur[changed], prev[changed], known[changed], slots[changed]
+        cur_cols = {f: cur[:, j] for j, f in enumerate(store.fields)}
+        prev_cols = {f: prev[:, j] for j, f in enumerate(store.fields)}
+        alerts = []
+        for trigger in self.triggers:
+            fired = trigger.fire(prev_cols, cur_cols, known)
+            if fired.any():
+                col = trigger.columns[0]
+                alerts.append(pd.DataFrame({
+                    self.id_column: ids[fired],
+                    "trigger": trigger.name,
+                    "column": col,
+                    "previous": prev_cols[col][fired],
+                    "current": cur_cols[col][fired],
+                }))
+
+        if (~known).any():
+            slots[~known] = store.insert(ids[~known])
+        store.set(slots, cur)
+        if alerts:
+            return pd.concat(alerts, ignore_index=True)
+        return pd.DataFrame(columns=[self.id_column, "trigger", "column", "previous", "current"])
+
+    def flush(self):
+        self.store.flush()
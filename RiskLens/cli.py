@@ -0,0 +1,365 @@
+# Command-line interface: `risklens score | drift | snapshot | allocate`
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from RiskLens import instrumentation
+from RiskLens.explainability.drift_detection import DriftSketch
+from RiskLens.modeling.limit_allocation import allocate_limits
+from RiskLens.modeling.risk_engine import ENGINE_VERSION, RiskEngine
+from RiskLens.modeling.score_store import RESULT_COLUMNS, ScoreStore
+
+PROGRESS_FILE = "_progress.json"
+
+
+def impact_column(factor):
+    """Output column name for a factor's impact, e.g. 'Loan-to-Income' -> 'impact_loan_to_income'."""
+    return "impact_" + re.sub(r"[^0-9a-z]+", "_", factor.lower()).strip("_")
+
+
+# --- Input streaming ---
+def _parquet_files(path):
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".parquet"))
+    return [path]
+
+
+def _timed(chunks):
+    """Yields from `chunks`, timing each read as the "cli.read_chunk" stage."""
+    while True:
+        with instrumentation.stage("cli.read_chunk") as s:
+            chunk = next(chunks, None)
+            s.add_rows(0 if chunk is None else len(chunk))
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _record_offset(path, records, block_size=1 << 20):
+    """
+    Byte offset just past the first `records` CSV records, found by
+    streaming the file in blocks: a newline ends a record when the quotes
+    before it are balanced, so quoted multi-line fields are not split.
+    Memory stays at one block however far the offset is.
+    """
+    offset, quotes = 0, 0
+    with open(path, "rb") as f:
+        while records > 0:
+            block = np.frombuffer(f.read(block_size), dtype=np.uint8)
+            if not len(block):
+                break
+            parity = (quotes + np.cumsum(block == ord('"'))) % 2
+            ends = np.flatnonzero((block == ord("\n")) & (parity == 0))
+            if len(ends) >= records:
+                return offset + int(ends[records - 1]) + 1
+            records -= len(ends)
+            quotes = int(parity[-1])
+            offset += len(block)
+    return offset
+
+
+def _csv_chunks(path, columns, chunk_size, skip):
+    wanted = set(columns)
+    header = list(pd.read_csv(path, nrows=0).columns)
+    # Resume by seeking past the completed rows: pandas' skiprows would still
+    # tokenize them (and a range builds a set of every skipped row number).
+    with open(path, "rb") as f:
+        f.seek(_record_offset(path, skip * chunk_size + 1))
+        reader = pd.read_csv(f, header=None, names=header, usecols=lambda c: c in wanted, chunksize=chunk_size)
+        for chunk in reader:
+            if len(chunk):
+                yield chunk
+
+
+def _parquet_chunks(path, columns, chunk_size, skip):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    for file in _parquet_files(path):
+        pf = pq.ParquetFile(file)
+        rows = pf.metadata.num_rows
+        n_chunks = -(-rows // chunk_size)
+        if skip >= n_chunks:
+            skip -= n_chunks
+            continue
+        # Start at the row group holding the first wanted row; earlier groups are not read.
+        first_row, skip = skip * chunk_size, 0
+        group_rows = [pf.metadata.row_group(i).num_rows for i in range(pf.num_row_groups)]
+        group, drop = 0, first_row
+        while drop >= group_rows[group]:
+            drop -= group_rows[group]
+            group += 1
+        present = [c for c in columns if c in pf.schema_arrow.names]
+        # Batches stop at row-group boundaries, so they are regrouped into exact chunk_size chunks.
+        buffer, buffered = [], 0
+        for batch in pf.iter_batches(batch_size=chunk_size, row_groups=range(group, pf.num_row_groups),
+                                     columns=present):
+            if drop:
+                cut = min(drop, len(batch))
+                batch, drop = batch.slice(cut), drop - cut
+            buffer.append(batch)
+            buffered += len(batch)
+            while buffered >= chunk_size:
+                table = pa.Table.from_batches(buffer)
+                yield table.slice(0, chunk_size).to_pandas()
+                buffer, buffered = table.slice(chunk_size).to_batches(), buffered - chunk_size
+        if buffered:
+            yield pa.Table.from_batches(buffer).to_pandas()
+
+
+def iter_chunks(path, columns, chunk_size=100000, skip=0):
+    """
+    Yields the input `chunk_size` rows at a time, as DataFrames restricted
+    to `columns`. For Parquet (a file or a directory of files) chunks do not
+    cross file boundaries. The first `skip` chunks are not materialized, so
+    resuming does not re-read completed work.
+    """
+    if path.endswith(".csv"):
+        return _timed(_csv_chunks(path, columns, chunk_size, skip))
+    return _timed(_parquet_chunks(path, columns, chunk_size, skip))
+
+
+# --- Progress checkpoint ---
+def _input_signature(path):
+    files = [path] if path.endswith(".csv") else _parquet_files(path)
+    return [[os.path.basename(f), os.path.getsize(f), int(os.path.getmtime(f))] for f in files]
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _load_progress(output, job):
+    """The checkpoint dict if it matches `job`, else {} when there is none."""
+    path = os.path.join(output, PROGRESS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        progress = json.load(f)
+    for key, value in job.items():
+        if progress.get(key) != value:
+            raise ValueError(f"Cannot resume: '{key}' changed since the last run ({progress.get(key)!r} -> {value!r})")
+    return progress
+
+
+def _write_part(path, frame):
+    with instrumentation.stage("cli.write_part", rows=len(frame)):
+        tmp = path + ".tmp"
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+
+# --- Commands ---
+def score(args, out=sys.stderr):
+    """Scores `args.input` chunk by chunk into Parquet part files under `args.output`."""
+    if args.metrics:
+        instrumentation.enable()
+    engine = RiskEngine(rules=args.rules)
+    id_columns = list(args.id_column or [])
+    columns = list(dict.fromkeys(
+        id_columns + engine.rules.features + ["fin_declared_income", "fin_existing_emi"]
+    ))
+    job = {
+        "input": os.path.abspath(args.input),
+        "input_files": _input_signature(args.input),
+        "rules_version": engine.rules.version,
+        "explain": args.explain,
+        "chunk_size": args.chunk_size,
+        "id_columns": id_columns,
+        "drift": bool(args.drift),
+    }
+
+    os.makedirs(args.output, exist_ok=True)
+    progress = _load_progress(args.output, job) if args.resume else {}
+    done_chunks, done_rows = progress.get("completed_chunks", 0), progress.get("rows", 0)
+    # The drift sketch is checkpointed with the progress, so a resumed run continues it exactly.
+    sketch = None
+    if args.drift:
+        sketch = DriftSketch.from_dict(progress["sketch"]) if progress.get("sketch") else DriftSketch.default()
+    if done_chunks:
+        print(f"Resuming after chunk {done_chunks - 1} ({done_rows:,} rows already scored)", file=out)
+    else:
+        for name in os.listdir(args.output):
+            if name.startswith("part-") or name == PROGRESS_FILE:
+                os.remove(os.path.join(args.output, name))
+
+    impact_names = [impact_column(f) for f in engine.rules.factors]
+    start = time.perf_counter()
+    chunk_no, rows = done_chunks, done_rows
+    for chunk in iter_chunks(args.input, columns, args.chunk_size, skip=done_chunks):
+        t0 = time.perf_counter()
+        # --profile samples the first chunk this run scores into collapsed (flamegraph) stacks.
+        profiling = args.profile and chunk_no == done_chunks
+        with instrumentation.profile(args.profile) if profiling else contextlib.nullcontext():
+            chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+            scored = engine.evaluate_batch(chunk, explain=args.explain)
+            results, matrix = scored if args.explain else (scored, None)
+
+            with instrumentation.stage("cli.build_part", rows=len(chunk)):
+                part = pd.DataFrame({"row": chunk.index.to_numpy()}, index=chunk.index)
+                for col in id_columns:
+                    part[col] = chunk[col]
+                part = pd.concat([part, results], axis=1)
+                if matrix is not None:
+                    impacts = pd.DataFrame(matrix.impacts, index=chunk.index, columns=impact_names)
+                    part = pd.concat([part, impacts], axis=1)
+            _write_part(os.path.join(args.output, f"part-{chunk_no:05d}.parquet"), part)
+            if sketch is not None:
+                with instrumentation.stage("cli.drift_sketch", rows=len(chunk)):
+                    sketch.update(results).update(chunk)
+
+        rows += len(chunk)
+        chunk_no += 1
+        _write_json(os.path.join(args.output, PROGRESS_FILE),
+                    dict(job, completed_chunks=chunk_no, rows=rows, sketch=sketch.to_dict() if sketch else None))
+        elapsed = time.perf_counter() - t0
+        print(f"chunk {chunk_no - 1}: {len(chunk):,} rows in {elapsed:.2f}s "
+              f"({len(chunk) / max(elapsed, 1e-9):,.0f} rows/sec)", file=out)
+
+    total = time.perf_counter() - start
+    new_rows = rows - done_rows
+    print(f"Scored {new_rows:,} rows in {total:.2f}s ({new_rows / max(total, 1e-9):,.0f} rows/sec); "
+          f"{rows:,} rows in {chunk_no} part files under {args.output}", file=out)
+    if sketch is not None:
+        sketch.save(args.drift)
+        print(f"Drift sketch written to {args.drift}", file=out)
+    if args.metrics:
+        instrumentation.write(args.metrics)
+        print(f"Stage metrics written to {args.metrics}", file=out)
+    if args.profile and chunk_no > done_chunks:
+        print(f"Profile of chunk {done_chunks} written to {args.profile}", file=out)
+    return 0
+
+
+def drift(args, out=None):
+    """Compares a current drift sketch against a reference sketch (PSI / KS per column)."""
+    out = out or sys.stdout
+    reference = DriftSketch.load(args.reference)
+    current = DriftSketch.load(args.current[0])
+    for path in args.current[1:]:  # e.g. per-worker or per-day sketches
+        current = current.merge(DriftSketch.load(path))
+    report = current.compare(reference)
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4f}"), file=out)
+    levels = {"moderate": ("moderate", "major"), "major": ("major",)}
+    if args.fail_on and report["status"].isin(levels[args.fail_on]).any():
+        return 1
+    return 0
+
+
+def snapshot(args, out=None):
+    """Stores the part files of a completed `score` run as a versioned snapshot in a score store."""
+    out = out or sys.stdout
+    progress_path = os.path.join(args.scored, PROGRESS_FILE)
+    if not os.path.exists(progress_path):
+        raise ValueError(f"{args.scored} is not a `risklens score` output directory")
+    with open(progress_path) as f:
+        progress = json.load(f)
+    id_column = args.id_column or (progress["id_columns"] or ["row"])[0]
+
+    scored = pd.read_parquet(args.scored)
+    if id_column not in scored:
+        raise ValueError(f"Id column '{id_column}' is not in the scored output")
+    factors = {impact_column(f): f for f in RiskEngine(rules=args.rules).rules.factors}
+    impact_cols = [c for c in scored if c.startswith("impact_")]
+    impacts = None
+    if impact_cols:
+        impacts = scored[impact_cols].rename(columns=lambda c: factors.get(c, c))
+
+    store = ScoreStore(args.store)
+    snap = store.write(
+        scored[id_column].to_numpy(),
+        scored[[c for c in RESULT_COLUMNS if c in scored]],
+        as_of=args.as_of,
+        version=f"{ENGINE_VERSION}-{progress['rules_version']}",
+        impacts=impacts,
+        id_column=id_column,
+    )
+    print(f"Stored {len(snap):,} scores as {snap.run_id} (as of {snap.as_of}) in {args.store}", file=out)
+    return 0
+
+
+def allocate(args, out=None):
+    """Allocates limits across a completed `score` run under exposure / expected-loss budgets."""
+    out = out or sys.stdout
+    scored = pd.read_parquet(args.scored)
+    allocation = allocate_limits(scored, args.exposure_budget, args.loss_budget, lgd=args.lgd,
+                                 margin=args.margin, floor=args.floor)
+    keep = [c for c in scored if not c.startswith("impact_")]
+    frame = pd.concat([scored[keep], allocation.to_frame()], axis=1)
+    frame.to_parquet(args.output, index=False)
+    for key, value in allocation.summary().items():
+        print(f"{key:<22} {value:,.4f}" if isinstance(value, float) else f"{key:<22} {value:,}", file=out)
+    print(f"Allocated limits written to {args.output}", file=out)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="risklens", description="RiskLens credit-risk tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("score", help="Batch-score a Parquet/CSV portfolio into Parquet part files")
+    p.add_argument("input", help="Parquet file, directory of Parquet files, or CSV file")
+    p.add_argument("output", help="Output directory (part-NNNNN.parquet files + progress checkpoint)")
+    p.add_argument("--chunk-size", type=int, default=100000, help="Rows per chunk (and per checkpoint)")
+    p.add_argument("--explain", action="store_true", help="Include one impact_<factor> column per rule")
+    p.add_argument("--id-column", action="append", help="Input column to copy to the output (repeatable)")
+    p.add_argument("--rules", help="Rule table JSON file (defaults to the built-in rules)")
+    p.add_argument("--resume", action="store_true", help="Continue after the last completed chunk")
+    p.add_argument("--drift", metavar="SKETCH", help="Also write a drift sketch (JSON) of scores and inputs")
+    p.add_argument("--metrics", metavar="PATH", help="Write per-stage timings (.prom for Prometheus text, else JSON)")
+    p.add_argument("--profile", metavar="STACKS", help="Sample the first chunk into flamegraph-compatible stacks")
+    p.set_defaults(func=score)
+
+    p = commands.add_parser("drift", help="PSI / KS drift of one or more sketches against a reference")
+    p.add_argument("reference", help="Reference drift sketch (JSON)")
+    p.add_argument("current", nargs="+", help="Current sketch(es); several are merged first")
+    p.add_argument("--fail-on", choices=["moderate", "major"], help="Exit with status 1 at this PSI level")
+    p.set_defaults(func=drift)
+
+    p = commands.add_parser("snapshot", help="Store a completed score run in a memory-mapped score store")
+    p.add_argument("scored", help="Output directory of `risklens score`")
+    p.add_argument("store", help="Score store directory (created if missing)")
+    p.add_argument("--as-of", help="Snapshot date, YYYY-MM-DD (defaults to today)")
+    p.add_argument("--id-column", help="Account id column (defaults to the run's first --id-column)")
+    p.add_argument("--rules", help="Rule table JSON file the run was scored with (names the impact columns)")
+    p.set_defaults(func=snapshot)
+
+    p = commands.add_parser("allocate", help="Allocate credit limits across a scored portfolio under budgets")
+    p.add_argument("scored", help="Output directory (or Parquet file) of `risklens score`")
+    p.add_argument("output", help="Parquet file for the scoring output plus allocated limits")
+    p.add_argument("--exposure-budget", type=float, required=True, help="Cap on the sum of allocated limits")
+    p.add_argument("--loss-budget", type=float, help="Cap on the sum of PD x LGD x limit")
+    p.add_argument("--lgd", type=float, default=0.45, help="Loss given default (default 0.45)")
+    p.add_argument("--margin", type=float, default=0.12, help="Return per rupee of limit on repayment (default 0.12)")
+    p.add_argument("--floor", choices=["min_limit"], help="Always grant at least this limit")
+    p.set_defaults(func=allocate)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    paths = [getattr(args, name, None) for name in ("input", "reference", "scored")] + list(getattr(args, "current", []))
+    for path in paths:
+        if path and not os.path.exists(path):
+            parser.error(f"input not found: {path}")
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(f"risklens: error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import io
+import os
+import time
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from RiskLens.instrumentation import instrumented
+
+STATEMENT_COLUMNS = ["Date", "Description", "Debit", "Credit", "Balance"]
+AMOUNT_COLUMNS = ["Debit", "Credit", "Balance"]
+
+_EXTENSIONS = {
+    ".csv": "csv", ".txt": "csv",
+    ".xlsx": "xlsx", ".xlsm": "xlsx", ".xls": "xls",
+    ".parquet": "parquet", ".pq": "parquet",
+}
+
+
+class StatementParseError(ValueError):
+    """Raised when an uploaded statement cannot be read or lacks required columns."""
+
+
+class ParsedStatement:
+    """A parsed statement: the typed transaction frame plus parse timing stats."""
+
+    def __init__(self, frame, stats):
+        self.frame = frame
+        self.stats = stats
+
+
+def _normalize(name):
+    return str(name).strip().title()
+
+
+def _column_map(headers):
+    """Maps each required column to the raw header it appears under."""
+    found = {}
+    for header in headers:
+        name = _normalize(header)
+        if name in STATEMENT_COLUMNS and name not in found:
+            found[name] = header
+    if len(found) < len(STATEMENT_COLUMNS):
+        raise StatementParseError(f"Missing columns. Required: {set(STATEMENT_COLUMNS)}")
+    return found
+
+
+def _detect_format(source, filename):
+    name = filename or getattr(source, "name", None) or (source if isinstance(source, (str, os.PathLike)) else "")
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext in _EXTENSIONS:
+        return _EXTENSIONS[ext]
+    # No usable extension: sniff the magic bytes.
+    head = source[:4] if isinstance(source, bytes) else None
+    if head is None and hasattr(source, "read"):
+        pos = source.tell()
+        head = source.read(4)
+        source.seek(pos)
+    if head is None:
+        with open(source, "rb") as fh:
+            head = fh.read(4)
+    if head == b"PAR1":
+        return "parquet"
+    if head[:2] == b"PK":
+        return "xlsx"
+    return "csv"
+
+
+def _coerce(chunk):
+    """Types one chunk of renamed statement columns."""
+    out = pd.DataFrame(index=chunk.index)
+    out["Date"] = pd.to_datetime(chunk["Date"], errors="coerce")
+    desc = chunk["Description"]
+    if not isinstance(desc.dtype, pd.CategoricalDtype):
+        desc = desc.astype("string").astype("category")
+    out["Description"] = desc
+    for col in AMOUNT_COLUMNS:
+        values = chunk[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values.astype("string").str.replace(",", "", regex=False), errors="coerce")
+        out[col] = values.fillna(0).astype(np.float32)
+    return out
+
+
+def _read_csv_chunks(source, chunk_size, typed=True):
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, "seek"):
+        source.seek(0)
+    columns = _column_map(header)
+    raw = {v: k for k, v in columns.items()}
+    if typed:
+        dtypes = {columns["Date"]: "string", columns["Description"]: "category"}
+        dtypes.update({columns[c]: "float32" for c in AMOUNT_COLUMNS})
+    else:
+        # Fallback for amounts with stray markers ("-", "CR"): read as strings
+        # and let the per-chunk coercion turn them into NaN -> 0.
+        dtypes = {h: "string" for h in raw}
+    reader = pd.read_csv(
+        source,
+        usecols=list(raw),
+        dtype=dtypes,
+        thousands=",",
+        chunksize=chunk_size,
+    )
+    for chunk in reader:
+        yield chunk.rename(columns=raw)
+
+
+def _read_xlsx_chunks(source, chunk_size):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise StatementParseError("Statement is empty")
+        columns = _column_map([h for h in header if h is not None])
+        positions = [list(header).index(columns[c]) for c in STATEMENT_COLUMNS]
+        while True:
+            block = list(islice(rows, chunk_size))
+            if not block:
+                break
+            picked = [[row[p] if p < len(row) else None for p in positions] for row in block]
+            yield pd.DataFrame(picked, columns=STATEMENT_COLUMNS, dtype=object)
+    finally:
+        wb.close()
+
+
+def _read_xls_chunks(source, chunk_size):
+    # Legacy .xls has no streaming reader; it is loaded in one piece.
+    df = pd.read_excel(source)
+    columns = _column_map(df.columns)
+    yield df[[columns[c] for c in STATEMENT_COLUMNS]].set_axis(STATEMENT_COLUMNS, axis=1)
+
+
+def _read_parquet_chunks(source, chunk_size):
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(source)
+    columns = _column_map(pf.schema_arrow.names)
+    raw = {v: k for k, v in columns.items()}
+    for batch in pf.iter_batches(batch_size=chunk_size, columns=list(raw)):
+        yield batch.to_pandas().rename(columns=raw)
+
+
+_READERS = {
+    "csv": _read_csv_chunks,
+    "xlsx": _read_xlsx_chunks,
+    "xls": _read_xls_chunks,
+    "parquet": _read_parquet_chunks,
+}
+
+
+@instrumented("ingestion.parse_statement", rows=lambda parsed: parsed.stats["rows"])
+def parse_bank_statement(source, filename=None, chunk_size=50000):
+    """
+    Parses a bank statement with columns Date, Description, Debit, Credit, Balance.
+
+    `source` may be a path, raw bytes or a binary file-like object (such as a
+    Streamlit upload). CSV, XLSX and Parquet are read in chunks of
+    `chunk_size` rows; headers are matched case- and whitespace-insensitively.
+    Returns a ParsedStatement whose frame has datetime64 dates, categorical
+    descriptions and float32 amounts. Raises StatementParseError on failure.
+    """
+    start = time.perf_counter()
+    fmt = _detect_format(source, filename)
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    try:
+        try:
+            chunks = [_coerce(chunk) for chunk in _READERS[fmt](source, chunk_size)]
+        except ValueError as e:
+            if fmt != "csv" or isinstance(e, StatementParseError):
+                raise
+            if hasattr(source, "seek"):
+                source.seek(0)
+            chunks = [_coerce(chunk) for chunk in _read_csv_chunks(source, chunk_size, typed=False)]
+    except StatementParseError:
+        raise
+    except Exception as e:
+        raise StatementParseError(f"Error reading file: {str(e)}") from e
+
+    n_chunks = len(chunks)
+    if not chunks:
+        chunks = [_coerce(pd.DataFrame({c: pd.Series(dtype=object) for c in STATEMENT_COLUMNS}))]
+    frame = pd.concat(chunks, ignore_index=True)
+    frame["Description"] = union_categoricals([c["Description"] for c in chunks])
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "format": fmt,
+        "rows": len(frame),
+        "chunks": n_chunks,
+        "parse_seconds": elapsed,
+        "rows_per_sec": len(frame) / elapsed if elapsed > 0 else float("inf"),
+        "memory_bytes": int(frame.memory_usage(deep=True).sum()),
+    }
+    return ParsedStatement(frame, stats)
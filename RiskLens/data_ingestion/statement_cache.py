@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from RiskLens.data_ingestion.bank_statement import ParsedStatement, parse_bank_statement
+
+
+def content_key(data):
+    """Hash of the raw statement bytes used as the cache key."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class StatementCache:
+    """
+    Parsed-statement cache keyed by file content hash.
+
+    Keeps parsed statements in memory with LRU eviction once their combined
+    frame size exceeds `max_bytes`. With `spill_dir` set, evicted statements
+    are written there as Parquet and reloaded on the next request instead of
+    being parsed again. Cached frames are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0
+        self.evictions = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_parse(self, source, filename=None):
+        """
+        Returns the ParsedStatement for `source` (bytes or a file-like object),
+        parsing it only if the same content has not been seen before.
+        """
+        data = source if isinstance(source, bytes) else _read_bytes(source)
+        filename = filename or getattr(source, "name", None)
+        key = content_key(data)
+
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return parsed
+
+        # Spill reads and parsing run outside the lock; only the counters are updated under it.
+        parsed = self._load_spill(key)
+        if parsed is not None:
+            with self._lock:
+                self.spill_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            parsed = parse_bank_statement(data, filename=filename)
+        self._put(key, parsed)
+        return parsed
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "spill_hits": self.spill_hits,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    # --- Internals ---
+    def _put(self, key, parsed):
+        size = int(parsed.frame.memory_usage(deep=True).sum())
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = parsed
+            self._sizes[key] = size
+            self.current_bytes += size
+            # Always keep the newest entry, even if it alone exceeds the budget.
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old = self._entries.popitem(last=False)
+                self.current_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+                evicted.append((old_key, old))
+        for old_key, old in evicted:
+            self._spill(old_key, old)
+
+    def _spill_paths(self, key):
+        base = os.path.join(self.spill_dir, key)
+        return base + ".parquet", base + ".json"
+
+    def _spill(self, key, parsed):
+        if not self.spill_dir:
+            return
+        frame_path, stats_path = self._spill_paths(key)
+        if os.path.exists(frame_path):
+            return
+        tmp = frame_path + ".tmp"
+        parsed.frame.to_parquet(tmp, index=False)
+        os.replace(tmp, frame_path)
+        with open(stats_path, "w", encoding="utf-8") as fh:
+            json.dump(parsed.stats, fh)
+
+    def _load_spill(self, key):
+        if not self.spill_dir:
+            return None
+        frame_path, stats_path = self._spill_paths(key)
+        if not os.path.exists(frame_path):
+            return None
+        frame = pd.read_parquet(frame_path)
+        stats = {}
+        if os.path.exists(stats_path):
+            with open(stats_path, "r", encoding="utf-8") as fh:
+                stats = json.load(fh)
+        return ParsedStatement(frame, stats)
+
+
+def _read_bytes(source):
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        pos = source.tell()
+        data = source.read()
+        source.seek(pos)
+        return data
+    with open(source, "rb") as fh:
+        return fh.read()
@@ -1,14 +1,38 @@
 import random
 import datetime
+import os
 import numpy as np
 import pandas as pd
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from RiskLens.instrumentation import instrumented
+
+# Category vocabularies for the string columns of `generate_batch`.
+RES_STATUSES = ["Indian", "NRI"]
+INCOME_STABILITY = ["Stable", "Variable", "Seasonal"]
+OCCUPATIONS = ["Salaried", "Self-Employed", "Business", "Professional"]
+EMPLOYER_TYPES = ["Govt", "PSU", "MNC", "Private", "SME", "Unemployed"]
+RESIDENCE_TYPES = ["Owned", "Rented", "Parental"]
+GEO_RISK_LEVELS = ["Low", "Medium", "High"]
+
+_PAN_LETTERS = np.frombuffer(b"ABCDE", dtype=np.uint8)
+_DIGITS = np.frombuffer(b"0123456789", dtype=np.uint8)
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
 
 class RiskProfileGenerator:
-    def __init__(self, seed=None):
+    def __init__(self, seed=None, as_of=None):
         if seed:
             random.seed(seed)
             np.random.seed(seed)
+        # `entropy` pins the whole stream: a None seed is resolved once here.
+        self.entropy = np.random.SeedSequence(seed).entropy
+        self.rng = np.random.default_rng(self.entropy)
+        self.as_of = as_of or datetime.date.today()
 
     def _generate_pan(self):
         chars = "ABCDE"
@@ -77,8 +101,146 @@ class RiskProfileGenerator:
         
         return profile
 
+    @instrumented("ingestion.generate_profiles", rows=len)
     def generate_batch(self, n=100):
-        return pd.DataFrame([self.generate_profile() for _ in range(n)])
+        """
+        Generates `n` profiles as a DataFrame, one vectorized draw per column.
+
+        Draws come from `self.rng`, so a seeded generator always produces the
+        same portfolio. Low-cardinality string columns are categorical.
+        """
+        return _draw_profiles(self.rng, n, self.as_of)
+
+    @instrumented("ingestion.generate_profiles", rows=len)
+    def generate_chunk(self, index, size):
+        """
+        Generates chunk number `index` of a streamed portfolio.
+
+        Each chunk draws from its own seed spawned from the generator seed, so
+        a chunk's content depends only on (seed, index, size) and chunks can
+        be produced in any order or in separate processes.
+        """
+        return _draw_profiles(_chunk_rng(self.entropy, index), size, self.as_of)
+
+    def iter_batches(self, total, chunk_size=100000, as_arrow=False):
+        """
+        Streams `total` profiles as fixed-size DataFrame chunks (the last one may
+        be shorter), or as pyarrow RecordBatches with `as_arrow=True`.
+        """
+        if as_arrow:
+            import pyarrow as pa
+        for index, size in _chunk_sizes(total, chunk_size):
+            df = self.generate_chunk(index, size)
+            df.index = pd.RangeIndex(index * chunk_size, index * chunk_size + size)
+            yield pa.RecordBatch.from_pandas(df, preserve_index=False) if as_arrow else df
+
+    def write_parquet(self, path, total, chunk_size=100000, workers=1):
+        """
+        Writes `total` profiles to a directory of Parquet parts, one file per
+        chunk (`part-00000.parquet`, ...). With `workers > 1` chunks are
+        generated in a process pool; the files are identical either way.
+        Returns the list of written file paths.
+        """
+        os.makedirs(path, exist_ok=True)
+        jobs = [
+            (self.entropy, self.as_of, index, size, os.path.join(path, f"part-{index:05d}.parquet"))
+            for index, size in _chunk_sizes(total, chunk_size)
+        ]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_write_part, jobs))
+        return [_write_part(job) for job in jobs]
+
+
+def _chunk_sizes(total, chunk_size):
+    for index, start in enumerate(range(0, total, chunk_size)):
+        yield index, min(chunk_size, total - start)
+
+
+def _chunk_rng(entropy, index):
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(index,)))
+
+
+def _write_part(job):
+    entropy, as_of, index, size, path = job
+    df = _draw_profiles(_chunk_rng(entropy, index), size, as_of)
+    df.to_parquet(path, index=False)
+    return path
+
+
+def _draw_profiles(rng, n, as_of):
+    """Draws `n` synthetic profiles from `rng`, one vectorized draw per column."""
+    today = np.datetime64(as_of, "D")
+
+    # Identity anchors
+    age = rng.integers(21, 66, n)
+    pan = np.empty((n, 10), dtype=np.uint8)
+    pan[:, :5] = _PAN_LETTERS[rng.integers(0, 5, (n, 5))]
+    pan[:, 5:9] = _DIGITS[rng.integers(0, 10, (n, 4))]
+    pan[:, 9] = _PAN_LETTERS[rng.integers(0, 5, n)]
+    aadhaar = np.empty((n, 14), dtype=np.uint8)
+    aadhaar[:, :10] = np.frombuffer(b"XXXX-XXXX-", dtype=np.uint8)
+    aadhaar[:, 10:] = _DIGITS[rng.integers(0, 10, (n, 4))]
+    dob = (today - age * np.timedelta64(365, "D")).astype(str)
+
+    income = rng.lognormal(13, 0.5, n).astype(np.int64)
+    emi = rng.exponential(5000, n).astype(np.int64)
+    collateral = rng.exponential(500000, n).astype(np.int64)
+
+    df = pd.DataFrame({
+        "id_pan": pan.view("S10").ravel().astype(str),
+        "id_aadhaar": aadhaar.view("S14").ravel().astype(str),
+        "id_dob": pd.Categorical(dob),
+        "id_age": age,
+        "id_res_status": _categorical((rng.random(n) >= 0.95).astype(np.int8), RES_STATUSES),
+
+        # Financial capacity
+        "fin_declared_income": income,
+        "fin_documented_income_verified": rng.random(n) < 2 / 3,
+        "fin_avg_monthly_balance": rng.lognormal(10, 1, n).astype(np.int64),
+        "fin_income_stability": _categorical(rng.integers(0, 3, n), INCOME_STABILITY),
+        "fin_existing_emi": emi,
+        "fin_dependents": rng.integers(0, 5, n),
+
+        # Employment stability
+        "emp_occupation": _categorical(rng.integers(0, 4, n), OCCUPATIONS),
+        "emp_employer_type": _categorical(rng.integers(0, 6, n), EMPLOYER_TYPES),
+        "emp_tenure_years": rng.integers(0, 21, n),
+
+        # Behavioural banking data
+        "beh_past_emi_bounces": rng.poisson(0.2, n),
+        "beh_overdraft_instances": rng.poisson(0.1, n),
+        "beh_avg_credit_utilization": rng.uniform(0, 1.0, n),
+        "beh_cash_withdrawal_ratio": rng.uniform(0, 1.0, n),
+        "beh_spending_shock": rng.random(n) < 0.25,
+
+        # External credit ecosystem
+        "ext_cibil_score": np.clip(rng.normal(750, 50, n), 300, 900).astype(np.int64),
+        "ext_open_credit_accounts": rng.integers(0, 11, n),
+        "ext_total_sanctioned_limit": rng.exponential(100000, n).astype(np.int64),
+        "ext_credit_history_years": rng.integers(1, 16, n),
+        "ext_inquiries_last_6m": rng.poisson(0.5, n),
+        "ext_previous_npa": rng.random(n) < 0.02,
+
+        # Asset and collateral signals
+        "asset_collateral_value": np.where(rng.random(n) > 0.7, collateral, 0),
+        "asset_residence_type": _categorical(rng.integers(0, 3, n), RESIDENCE_TYPES),
+
+        # Customer profile risk flags
+        "prof_address_changes_last_3y": rng.poisson(0.3, n),
+        "prof_geo_risk_score": _categorical(rng.integers(0, 3, n), GEO_RISK_LEVELS),
+
+        # Account-level operational metadata
+        "ops_tenure_months": rng.integers(1, 121, n),
+        "ops_active_products": rng.integers(1, 6, n),
+        "ops_savings_consistency": rng.uniform(0, 1, n),
+    })
+
+    # Derived fields for logic
+    df["fin_lti_ratio"] = (emi * 12) / (income + 1)
+
+    return df
+
 
 if __name__ == "__main__":
     gen = RiskProfileGenerator()
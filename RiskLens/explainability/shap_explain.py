@@ -0,0 +1,159 @@
+# TreeSHAP explanations for the model-backed scoring path
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from RiskLens.modeling.model_engine import FEATURE_NAMES, feature_matrix, feature_vector
+
+BIAS = "bias"
+
+# Human-readable labels for the waterfall.
+FEATURE_LABELS = {
+    "id_age": "Age",
+    "fin_declared_income": "Declared Income",
+    "fin_avg_monthly_balance": "Avg Monthly Balance",
+    "fin_existing_emi": "Existing EMI",
+    "fin_dependents": "Dependents",
+    "fin_lti_ratio": "Loan-to-Income",
+    "emp_tenure_years": "Employment Tenure",
+    "beh_past_emi_bounces": "EMI Bounces",
+    "beh_overdraft_instances": "Overdrafts",
+    "beh_avg_credit_utilization": "Credit Utilization",
+    "beh_cash_withdrawal_ratio": "Cash Withdrawals",
+    "ext_cibil_score": "CIBIL Score",
+    "ext_open_credit_accounts": "Open Credit Accounts",
+    "ext_total_sanctioned_limit": "Sanctioned Limit",
+    "ext_credit_history_years": "Credit History",
+    "ext_inquiries_last_6m": "Recent Inquiries",
+    "asset_collateral_value": "Collateral",
+    "prof_address_changes_last_3y": "Address Changes",
+    "ops_tenure_months": "Relationship Tenure",
+    "ops_active_products": "Active Products",
+    "ops_savings_consistency": "Savings Consistency",
+    "fin_documented_income_verified": "Income Verification",
+    "beh_spending_shock": "Spending Shock",
+    "ext_previous_npa": "Previous NPA",
+    "id_res_status": "Residential Status",
+    "fin_income_stability": "Income Stability",
+    "emp_occupation": "Occupation",
+    "emp_employer_type": "Employer Type",
+    "asset_residence_type": "Residence Type",
+    "prof_geo_risk_score": "Geo Risk",
+}
+
+
+def tree_contributions(booster, X, chunk_size=200000):
+    """
+    Exact TreeSHAP values for an encoded float32 matrix via the library's
+    native `pred_contribs` / `pred_contrib`: (n_rows x n_features + 1)
+    float32, last column the bias. Rows sum to the model's log-odds.
+    Computed `chunk_size` rows at a time to bound the temporary memory.
+    """
+    backend = type(booster).__module__.split(".")[0]
+    out = np.empty((len(X), X.shape[1] + 1), dtype=np.float32)
+    for start in range(0, len(X), chunk_size):
+        chunk = X[start:start + chunk_size]
+        if backend == "xgboost":
+            import xgboost as xgb
+
+            contribs = booster.predict(xgb.DMatrix(chunk, feature_names=FEATURE_NAMES), pred_contribs=True)
+        else:
+            contribs = booster.predict(chunk, pred_contrib=True)
+        out[start:start + len(chunk)] = contribs
+    return out
+
+
+def _input_key(X):
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(X.shape).encode())
+    digest.update(np.ascontiguousarray(X, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+class ShapExplainer:
+    """
+    Batched TreeSHAP for a `ModelRiskEngine`, with an explanation cache.
+
+    Explanations are cached per (model version, hash of the encoded input
+    matrix), so reopening a report or re-explaining the same portfolio is a
+    lookup; retraining the model changes the version and misses. The cache
+    is an LRU bounded by `max_bytes` of contribution arrays. Cached arrays
+    are shared and must be treated as read-only.
+    """
+
+    def __init__(self, engine, max_bytes=256 * 1024 * 1024, chunk_size=200000):
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def explain_matrix(self, X):
+        key = (self.engine.model_version, _input_key(X))
+        with self._lock:
+            contribs = self._entries.get(key)
+            if contribs is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return contribs
+            self.misses += 1
+
+        contribs = tree_contributions(self.engine.booster, X, self.chunk_size)
+        contribs.flags.writeable = False
+        if contribs.nbytes <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = contribs
+                    self.current_bytes += contribs.nbytes
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.current_bytes -= evicted.nbytes
+                    self.evictions += 1
+        return contribs
+
+    def explain_frame(self, df):
+        """SHAP values (log-odds of default) for a whole portfolio, one column per feature plus bias."""
+        contribs = self.explain_matrix(feature_matrix(df))
+        return pd.DataFrame(contribs, index=df.index, columns=FEATURE_NAMES + [BIAS])
+
+    def explain_profile(self, profile):
+        """SHAP values for one profile dict as a Series (feature -> log-odds contribution)."""
+        return pd.Series(self.explain_matrix(feature_vector(profile))[0], index=FEATURE_NAMES + [BIAS])
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def waterfall(contributions, top_n=8):
+    """
+    Waterfall steps for one explanation (a Series from `explain_profile` or
+    a row of `explain_frame`): the bias, the `top_n` largest contributions
+    by magnitude (labelled), the remainder as "Other features", and the
+    total log-odds. Returns a list of (label, value, measure) tuples.
+    """
+    values = contributions.drop(BIAS)
+    order = values.abs().sort_values(ascending=False, kind="stable").index
+    top, rest = order[:top_n], order[top_n:]
+    steps = [("Base (log-odds)", float(contributions[BIAS]), "absolute")]
+    steps += [(FEATURE_LABELS.get(name, name), float(values[name]), "relative") for name in top]
+    if len(rest):
+        steps.append(("Other features", float(values[rest].sum()), "relative"))
+    steps.append(("Model log-odds", float(contributions.sum()), "total"))
+    return steps
@@ -1,17 +1,88 @@
 # Feature engineering for account activity metrics
 
+import numpy as np
+import pandas as pd
+
+from RiskLens.feature_engineering.grouping import GroupedFrame, grouped_rolling_std
+
+
 class AccountActivityFeatures:
-    def __init__(self, df):
+    """
+    Account activity features for a whole portfolio at once.
+
+    `df` holds one row per transaction for many accounts (account id, date,
+    signed amount, running balance). Rows are sorted once by (account, date)
+    and every feature is a vectorized per-account reduction; pass `grouped`
+    to reuse a GroupedFrame that another feature class already built.
+    """
+
+    def __init__(self, df, account_col="account_id", date_col="txn_date",
+                 amount_col="amount", balance_col="balance", grouped=None):
         self.df = df
+        self.account_col = account_col
+        self.date_col = date_col
+        self.amount_col = amount_col
+        self.balance_col = balance_col
+        self.grouped = grouped if grouped is not None else GroupedFrame(df, account_col, date_col)
 
     def transaction_velocity(self):
         """Compute # of transactions per week/month."""
-        pass
+        g = self.grouped
+        days = g.days(self.date_col)
+        last = g.broadcast(g.last(days))
+        span_days = (g.last(days) - g.first(days) + 1).astype(np.float64)
+        return pd.DataFrame({
+            "txn_count_7d": g.count(days > last - 7),
+            "txn_count_30d": g.count(days > last - 30),
+            "avg_weekly_txns": g.sizes / np.maximum(span_days / 7, 1.0),
+            "avg_monthly_txns": g.sizes / np.maximum(span_days / 30.44, 1.0),
+        }, index=g.index)
 
     def average_transaction_size(self):
         """Compute median vs. mean transaction size to spot outliers."""
-        pass
+        g = self.grouped
+        size = np.abs(g.column(self.amount_col, np.float64))
+        mean = g.mean(size)
+        median = g.median(size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = np.where(median > 0, mean / median, np.nan)
+        return pd.DataFrame({
+            "mean_txn_size": mean,
+            "median_txn_size": median,
+            "mean_median_size_ratio": ratio,
+        }, index=g.index)
+
+    def balance_fluctuation(self, window=30):
+        """
+        Compute rolling volatility of daily closing balances over the last
+        `window` calendar days (days without transactions are not filled).
+        """
+        g = self.grouped
+        days = g.days(self.date_col)
+        balance = g.column(self.balance_col, np.float64)
+        # Closing balance per (account, day): the last row of each day.
+        if g.n_rows:
+            day_end = np.r_[(g.group_ids[1:] != g.group_ids[:-1]) | (days[1:] != days[:-1]), True]
+        else:
+            day_end = np.zeros(0, dtype=bool)
+        daily_ids = g.group_ids[day_end]
+        daily_balance = balance[day_end]
+        daily_starts = np.searchsorted(daily_ids, np.arange(g.n_groups))
+        vol = grouped_rolling_std(daily_ids, daily_starts, daily_balance, window, positions=days[day_end])
+        daily_ends = np.searchsorted(daily_ids, np.arange(g.n_groups), side="right") - 1
+        mean_balance = np.bincount(daily_ids, weights=daily_balance) / np.bincount(daily_ids)
+        latest = vol[daily_ends]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cv = np.where(mean_balance != 0, latest / np.abs(mean_balance), np.nan)
+        return pd.DataFrame({
+            f"balance_volatility_{window}d": latest,
+            "balance_volatility_mean": pd.Series(vol).groupby(daily_ids).mean().reindex(range(g.n_groups)).to_numpy(),
+            "balance_cv": cv,
+        }, index=g.index)
 
-    def balance_fluctuation(self):
-        """Compute rolling volatility of daily balances."""
-        pass 
\ No newline at end of file
+    def features(self):
+        """All account activity features as one wide frame indexed by account."""
+        return pd.concat(
+            [self.transaction_velocity(), self.average_transaction_size(), self.balance_fluctuation()],
+            axis=1,
+        )
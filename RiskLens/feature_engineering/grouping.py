@@ -0,0 +1,122 @@
+# Shared grouped-array helpers for portfolio-wide feature computation
+
+import numpy as np
+import pandas as pd
+
+
+class GroupedFrame:
+    """
+    A frame sorted once by (key, order) with precomputed group boundaries.
+
+    Every per-account feature is then a reduction over contiguous row ranges
+    (`np.add.reduceat`, `np.bincount`, cumulative sums), so no Python loop ever
+    runs per account. Several feature classes can share one instance.
+    """
+
+    def __init__(self, df, key, order=None):
+        key_codes, _ = pd.factorize(df[key])
+        if order is None:
+            perm = np.argsort(key_codes, kind="stable")
+        else:
+            perm = np.lexsort((df[order].to_numpy(), key_codes))
+        self.df = df
+        self.key = key
+        self.order = order
+        self.perm = perm
+        codes = key_codes[perm]
+        self.n_rows = len(perm)
+        self.starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if self.n_rows else np.array([], dtype=np.int64)
+        self.ends = np.r_[self.starts[1:], self.n_rows].astype(np.int64) if self.n_rows else np.array([], dtype=np.int64)
+        self.sizes = self.ends - self.starts
+        self.n_groups = len(self.starts)
+        self.group_ids = np.repeat(np.arange(self.n_groups), self.sizes)
+        self.index = pd.Index(df[key].to_numpy()[perm][self.starts], name=key)
+        self._columns = {}
+
+    def column(self, name, dtype=None):
+        """Column `name` in sorted order (cached)."""
+        cache_key = (name, dtype)
+        if cache_key not in self._columns:
+            self._columns[cache_key] = self.df[name].to_numpy(dtype=dtype)[self.perm]
+        return self._columns[cache_key]
+
+    def days(self, name):
+        """Datetime column `name` in sorted order as integer days since epoch."""
+        if (name, "days") not in self._columns:
+            values = self.column(name).astype("datetime64[D]").astype(np.int64)
+            self._columns[(name, "days")] = values
+        return self._columns[(name, "days")]
+
+    # --- Per-group reductions ---
+    def count(self, mask=None):
+        if mask is None:
+            return self.sizes.astype(np.float64)
+        return np.bincount(self.group_ids, weights=mask.astype(np.float64), minlength=self.n_groups)
+
+    def sum(self, values):
+        return np.bincount(self.group_ids, weights=values, minlength=self.n_groups)
+
+    def mean(self, values):
+        return self.sum(values) / self.sizes
+
+    def first(self, values):
+        return values[self.starts]
+
+    def last(self, values):
+        return values[self.ends - 1]
+
+    def max(self, values):
+        return np.maximum.reduceat(values, self.starts) if self.n_groups else values[:0]
+
+    def min(self, values):
+        return np.minimum.reduceat(values, self.starts) if self.n_groups else values[:0]
+
+    def median(self, values):
+        return pd.Series(values).groupby(self.group_ids).median().to_numpy()
+
+    def broadcast(self, per_group):
+        """Expands a per-group array back to one value per (sorted) row."""
+        return per_group[self.group_ids]
+
+
+def grouped_rolling_std(group_ids, starts, values, window, min_periods=2, positions=None):
+    """
+    Rolling sample std over the last `window` rows within each group, or,
+    with `positions` (e.g. integer days, ascending within each group), over
+    the rows whose position lies in (position - window, position].
+
+    `group_ids` must be sorted (rows of a group contiguous) and `starts` the
+    first row of each group. Uses per-group cumulative sums of group-demeaned
+    values, so the cost is O(n) regardless of the window length (O(n log n)
+    with `positions`). The sums restart at every group: running totals
+    carried over from high-variance groups would otherwise swamp the
+    differences of a low-variance one.
+    """
+    n = len(values)
+    if n == 0:
+        return np.array([], dtype=np.float64)
+    sizes = np.diff(np.r_[starts, n])
+    means = np.bincount(group_ids, weights=values) / sizes
+    x = values - means[group_ids]
+    by_group = pd.DataFrame({"x": x, "x2": x * x}).groupby(group_ids, sort=False)
+    sums = by_group.cumsum()
+    c1 = sums["x"].to_numpy()
+    c2 = sums["x2"].to_numpy()
+    i = np.arange(n)
+    if positions is None:
+        lo = np.maximum(i - window + 1, starts[group_ids])
+    else:
+        # Offsetting each group past the previous one makes (group, position)
+        # one ascending key, so a single searchsorted finds every window start.
+        pos = positions - positions.min()
+        key = group_ids * (int(pos.max()) + window + 1) + pos
+        lo = np.searchsorted(key, key - window + 1, side="left")
+    cnt = i - lo + 1
+    # Sums of rows lo..i: the group's running total minus the part before lo.
+    inside = lo > starts[group_ids]
+    s1 = c1 - np.where(inside, c1[lo - 1], 0.0)
+    s2 = c2 - np.where(inside, c2[lo - 1], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (s2 - s1 * s1 / cnt) / (cnt - 1)
+    var = np.where(cnt >= min_periods, np.maximum(var, 0.0), np.nan)
+    return np.sqrt(var)
@@ -1,13 +1,214 @@
 # Feature engineering for payment behavior (DPD, payment consistency, etc.)
 
+import os
+
+import numpy as np
+import pandas as pd
+
+DPD_BUCKETS = ["current", "1-29", "30-59", "60-89", "90+"]
+_DPD_THRESHOLDS = (30, 60, 90)
+_STATE_COLUMNS = ["max_paid_dpd", "n_payments", "mean_delay", "m2_delay"] + [f"paid_dpd_{t}" for t in _DPD_THRESHOLDS]
+
+
+def _days(values):
+    return pd.to_datetime(values).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def _merge_payments(accounts, b):
+    """Folds per-account payment aggregates `b` into `accounts` in place (Welford / Chan merge)."""
+    if not len(b):
+        return
+    m2_b = b["var"].fillna(0).to_numpy() * (b["n"].to_numpy() - 1)
+    cur = accounts.loc[b.index]
+    n_a, mean_a, m2_a = cur["n_payments"].to_numpy(), cur["mean_delay"].to_numpy(), cur["m2_delay"].to_numpy()
+    n_b, mean_b = b["n"].to_numpy(dtype=np.float64), b["mean"].to_numpy()
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    accounts.loc[b.index, "mean_delay"] = mean_a + delta * n_b / n
+    accounts.loc[b.index, "m2_delay"] = m2_a + m2_b + delta * delta * n_a * n_b / n
+    accounts.loc[b.index, "n_payments"] = n
+    accounts.loc[b.index, "max_paid_dpd"] = np.maximum(cur["max_paid_dpd"].to_numpy(), b["dpd"].to_numpy())
+    for t in _DPD_THRESHOLDS:
+        accounts.loc[b.index, f"paid_dpd_{t}"] = cur[f"paid_dpd_{t}"].to_numpy() + b[f"ge_{t}"].to_numpy()
+
+
+class DPDState:
+    """
+    Persistent per-account repayment state for incremental DPD updates.
+
+    Holds, per account, the worst DPD among paid installments, a running
+    mean / M2 (Welford) of payment-date deltas and counts of paid
+    installments past 30/60/90 days, plus the small table of installments
+    that are due but still unpaid. `update` applies only one day's events,
+    so the daily cost scales with the events and the outstanding table
+    rather than the full repayment history.
+    """
+
+    def __init__(self, accounts=None, outstanding=None, account_col="account_id",
+                 due_col="due_date", paid_col="paid_date", installment_col=None):
+        self.account_col = account_col
+        self.due_col = due_col
+        self.paid_col = paid_col
+        self.installment_col = installment_col
+        self._keys = [account_col, due_col] + ([installment_col] if installment_col else [])
+        if accounts is None:
+            accounts = self._empty_accounts()
+        if outstanding is None:
+            outstanding = pd.DataFrame({c: pd.Series(dtype=object) for c in self._keys})
+            outstanding[due_col] = pd.Series(dtype="datetime64[ns]")
+        self._accounts = accounts
+        # Accounts first seen since the last fold into `_accounts`: kept apart
+        # so a batch with new accounts copies this small frame, not the state.
+        self._fresh = self._empty_accounts()
+        self.outstanding = outstanding
+
+    def _empty_accounts(self):
+        accounts = pd.DataFrame({c: pd.Series(dtype=np.float64) for c in _STATE_COLUMNS})
+        accounts.index.name = self.account_col
+        return accounts
+
+    def _fold(self):
+        if len(self._fresh):
+            self._accounts = pd.concat([self._accounts, self._fresh]) if len(self._accounts) else self._fresh
+            self._accounts.index.name = self.account_col
+            self._fresh = self._empty_accounts()
+
+    @property
+    def accounts(self):
+        """Per-account state, including the accounts added since the last fold."""
+        self._fold()
+        return self._accounts
+
+    def update(self, events):
+        """
+        Applies repayment events: one row per installment with the account,
+        due date and paid date. A missing paid date means the installment
+        fell due unpaid; a paid row settles the matching outstanding
+        installment (if any, including one that fell due in the same batch)
+        and feeds the payment statistics.
+        """
+        paid_mask = events[self.paid_col].notna().to_numpy()
+        new_due = events.loc[~paid_mask, self._keys]
+        payments = events.loc[paid_mask]
+
+        # Outstanding installments: add the new ones, then drop every one paid
+        # in this batch, so a batch may hold both events of one installment.
+        if len(new_due):
+            self.outstanding = pd.concat([self.outstanding, new_due], ignore_index=True)
+        if len(payments) and len(self.outstanding):
+            settled = pd.MultiIndex.from_frame(payments[self._keys])
+            keep = ~pd.MultiIndex.from_frame(self.outstanding[self._keys]).isin(settled)
+            self.outstanding = self.outstanding.loc[keep]
+
+        seen = pd.Index(events[self.account_col].unique())
+        new_accounts = seen[~seen.isin(self._accounts.index) & ~seen.isin(self._fresh.index)]
+        if len(new_accounts):
+            fresh = pd.DataFrame(0.0, index=new_accounts, columns=_STATE_COLUMNS)
+            self._fresh = pd.concat([self._fresh, fresh]) if len(self._fresh) else fresh
+            self._fresh.index.name = self.account_col
+        if len(payments):
+            delay = (_days(payments[self.paid_col]) - _days(payments[self.due_col])).astype(np.float64)
+            batch = pd.DataFrame({"delay": delay, "dpd": np.maximum(delay, 0)})
+            for t in _DPD_THRESHOLDS:
+                batch[f"ge_{t}"] = batch["dpd"] >= t
+            grouped = batch.groupby(payments[self.account_col].to_numpy())
+            b = grouped.agg(n=("delay", "size"), mean=("delay", "mean"), var=("delay", "var"), dpd=("dpd", "max"),
+                            **{f"ge_{t}": (f"ge_{t}", "sum") for t in _DPD_THRESHOLDS})
+            known = b.index.isin(self._accounts.index)
+            _merge_payments(self._accounts, b[known])
+            _merge_payments(self._fresh, b[~known])
+        # Fold once the new accounts are a sizeable share of the state, so the
+        # copying stays proportional to the accounts added.
+        if len(self._fresh) > max(1024, len(self._accounts) // 8):
+            self._fold()
+        return self
+
+    def dpd_snapshot(self, as_of):
+        """DPD features for every known account as of `as_of`."""
+        as_of_day = _days([as_of])[0]
+        idx = self.accounts.index
+        due = self.outstanding[self.outstanding[self.due_col] <= pd.Timestamp(as_of)]
+        unpaid_dpd = pd.Series(as_of_day - _days(due[self.due_col]), index=due[self.account_col].to_numpy(), dtype=np.float64)
+        by_account = unpaid_dpd.groupby(level=0)
+
+        current = by_account.max().reindex(idx, fill_value=0).to_numpy()
+        max_dpd = np.maximum(self.accounts["max_paid_dpd"].to_numpy(), current)
+        out = pd.DataFrame({"current_dpd": current.astype(np.int64), "max_dpd": max_dpd.astype(np.int64)}, index=idx)
+        out["dpd_bucket"] = pd.Categorical.from_codes(
+            np.searchsorted([1, 30, 60, 90], current, side="right"), categories=DPD_BUCKETS
+        )
+        for t in _DPD_THRESHOLDS:
+            unpaid_over = (unpaid_dpd >= t).groupby(level=0).sum().reindex(idx, fill_value=0).to_numpy()
+            out[f"dpd_{t}_count"] = (self.accounts[f"paid_dpd_{t}"].to_numpy() + unpaid_over).astype(np.int64)
+        return out
+
+    def consistency_snapshot(self):
+        """Payment-delay statistics (days paid after due date) per account."""
+        n = self.accounts["n_payments"].to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.where(n > 1, np.sqrt(self.accounts["m2_delay"].to_numpy() / (n - 1)), np.nan)
+        return pd.DataFrame({
+            "n_payments": n.astype(np.int64),
+            "mean_payment_delay": np.where(n > 0, self.accounts["mean_delay"].to_numpy(), np.nan),
+            "payment_delay_std": std,
+        }, index=self.accounts.index)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.accounts.to_parquet(os.path.join(path, "accounts.parquet"))
+        self.outstanding.to_parquet(os.path.join(path, "outstanding.parquet"), index=False)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        return cls(
+            accounts=pd.read_parquet(os.path.join(path, "accounts.parquet")),
+            outstanding=pd.read_parquet(os.path.join(path, "outstanding.parquet")),
+            **kwargs,
+        )
+
+
 class PaymentBehaviorFeatures:
-    def __init__(self, df):
+    """
+    Payment behavior features over a full repayment history.
+
+    `df` has one row per installment (account id, due date, paid date; a
+    missing paid date means unpaid). The full computation replays the
+    history through `DPDState`, so it gives exactly what the incremental
+    daily updates accumulate.
+    """
+
+    def __init__(self, df, account_col="account_id", due_col="due_date",
+                 paid_col="paid_date", installment_col=None, as_of=None):
         self.df = df
+        self.account_col = account_col
+        self.due_col = due_col
+        self.paid_col = paid_col
+        self.installment_col = installment_col
+        self.as_of = as_of
+        self._state = None
+
+    def _as_of(self):
+        if self.as_of is not None:
+            return pd.Timestamp(self.as_of)
+        return max(self.df[self.due_col].max(), self.df[self.paid_col].max())
+
+    def state(self):
+        """DPDState built from the history up to `as_of` (cached)."""
+        if self._state is None:
+            as_of = self._as_of()
+            history = self.df[self.df[self.due_col] <= as_of]
+            # Payments after `as_of` have not happened yet.
+            history = history.assign(**{self.paid_col: history[self.paid_col].where(history[self.paid_col] <= as_of)})
+            self._state = DPDState(
+                account_col=self.account_col, due_col=self.due_col,
+                paid_col=self.paid_col, installment_col=self.installment_col,
+            ).update(history)
+        return self._state
 
     def compute_dpd_buckets(self):
         """Compute 30-, 60-, 90-day DPD buckets."""
-        pass
+        return self.state().dpd_snapshot(self._as_of())
 
     def payment_consistency(self):
         """Compute std. dev. of payment dates vs. due dates."""
-        pass 
\ No newline at end of file
+        return self.state().consistency_snapshot()
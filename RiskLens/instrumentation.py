@@ -0,0 +1,266 @@
+# Hot-path instrumentation: per-stage timers, row counters, allocation stats and a sampling profiler
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+ENV_VAR = "RISKLENS_INSTRUMENT"
+
+
+class _State:
+    enabled = os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes")
+    track_memory = False
+
+
+_state = _State()
+_lock = threading.Lock()
+_stages = {}
+
+
+def enable(track_memory=False):
+    """
+    Turns instrumentation on (also via RISKLENS_INSTRUMENT=1). With
+    `track_memory` every stage also records its tracemalloc allocation peak,
+    which slows allocation-heavy code noticeably; nested stages reset the
+    peak of the stage around them, so those peaks are exact only for
+    innermost stages.
+    """
+    _state.enabled = True
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _state.track_memory = track_memory
+
+
+def disable():
+    _state.enabled = False
+    if _state.track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _state.track_memory = False
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+
+
+# --- Stage timers ---
+class _NoopStage:
+    rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_rows(self, n):
+        pass
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        if _state.track_memory:
+            self._mem_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        elapsed = time.perf_counter() - self._start
+        alloc = None
+        if _state.track_memory and tracemalloc.is_tracing():
+            alloc = max(tracemalloc.get_traced_memory()[1] - self._mem_start, 0)
+        with _lock:
+            s = _stages.get(self.name)
+            if s is None:
+                s = _stages[self.name] = {"calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                          "rows": 0, "alloc_peak_bytes": None}
+            s["calls"] += 1
+            s["errors"] += exc_type is not None
+            s["seconds"] += elapsed
+            s["max_seconds"] = max(s["max_seconds"], elapsed)
+            s["rows"] += self.rows
+            if alloc is not None:
+                s["alloc_peak_bytes"] = max(s["alloc_peak_bytes"] or 0, alloc)
+        return False
+
+    def add_rows(self, n):
+        self.rows += n
+
+
+def stage(name, rows=0):
+    """
+    Times a block as stage `name`: `with stage("ingestion.parse") as s: ...;
+    s.add_rows(n)`. When instrumentation is disabled this returns a shared
+    no-op object, so an instrumented call site costs one flag check.
+    """
+    if not _state.enabled:
+        return _NOOP
+    return _Stage(name, rows)
+
+
+def instrumented(name, rows=None):
+    """
+    Decorator form of `stage`. `rows(result)` gives the row count of a call
+    (one row per call by default). Disabled, the wrapper only adds a flag
+    check to the call.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return fn(*args, **kwargs)
+            with _Stage(name, 0) as s:
+                result = fn(*args, **kwargs)
+                s.add_rows(rows(result) if rows is not None else 1)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def batch_rows(result):
+    """Row count of an `evaluate_batch`-style result: a frame or a (frame, explanation) tuple."""
+    return len(result[0] if isinstance(result, tuple) else result)
+
+
+# --- Export ---
+def snapshot():
+    """Per-stage totals: {stage: {calls, errors, seconds, max_seconds, rows, rows_per_sec, alloc_peak_bytes}}."""
+    with _lock:
+        stages = {name: dict(s) for name, s in _stages.items()}
+    for s in stages.values():
+        s["rows_per_sec"] = s["rows"] / s["seconds"] if s["seconds"] > 0 else None
+    return stages
+
+
+def to_json():
+    return json.dumps({"stages": snapshot()}, indent=2)
+
+
+_PROMETHEUS = [
+    ("calls", "risklens_stage_calls_total", "counter", "Calls of each instrumented stage."),
+    ("errors", "risklens_stage_errors_total", "counter", "Calls of each stage that raised."),
+    ("seconds", "risklens_stage_seconds_total", "counter", "Wall time spent in each stage."),
+    ("max_seconds", "risklens_stage_max_seconds", "gauge", "Slowest single call of each stage."),
+    ("rows", "risklens_stage_rows_total", "counter", "Rows processed by each stage."),
+    ("alloc_peak_bytes", "risklens_stage_alloc_peak_bytes", "gauge", "Largest traced allocation peak of a call."),
+]
+
+
+def to_prometheus():
+    """The stage totals in the Prometheus text exposition format."""
+    stages = snapshot()
+    lines = []
+    for key, metric, kind, help_text in _PROMETHEUS:
+        samples = [(name, s[key]) for name, s in sorted(stages.items()) if s[key] is not None]
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, value in samples:
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{metric}{{stage="{label}"}} {value:.9g}')
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def write(path):
+    """Writes the stage totals to `path`: Prometheus text for .prom/.txt, JSON otherwise."""
+    text = to_prometheus() if str(path).endswith((".prom", ".txt")) else to_json()
+    tmp = str(path) + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# --- Sampling profiler ---
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread and counts identical stacks. `collapsed()` returns
+    them in the folded format (`a;b;c count`) that flamegraph.pl,
+    speedscope and inferno read. Samples land between bytecodes, so time in
+    a long C call (a numpy kernel) is attributed to the Python function
+    that made it.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.thread_id = self.thread_id or threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="risklens-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, path):
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+
+
+@contextlib.contextmanager
+def profile(path, interval=0.005):
+    """`with profile("stacks.txt"): score(batch)` writes the collapsed stacks of the block to a file."""
+    profiler = SamplingProfiler(interval).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.write(path)
@@ -0,0 +1,135 @@
+# Memoized scoring for retried / resubmitted applications
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+# Key markers for an absent field and a NaN value. Neither scores like an
+# explicit None (absent fields take the rule default, NaN is truthy for flag
+# rules), so each gets its own slot; tuples never come out of `_normalize`.
+_ABSENT = ("<absent>",)
+_NAN = ("<nan>",)
+
+
+def _normalize(value):
+    """Canonical form of one input so equal inputs share a key (720 == 720.0 == np.int64(720))."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return _NAN if math.isnan(value) else float(value)
+    return str(value)
+
+
+class ScoringCache:
+    """
+    LRU + TTL cache in front of `RiskEngine.evaluate`.
+
+    The key is the tuple of normalized values of exactly the fields scoring
+    reads (`engine.features`: rule inputs plus income and EMI), so
+    identifiers and unrelated fields do not split entries. Entries are
+    tagged with `engine.version`; when the rules are reloaded or the engine
+    code changes, the whole cache is dropped on the next call, so a stale
+    score is never served. Thread-safe.
+    """
+
+    def __init__(self, engine=None, max_entries=100000, ttl_seconds=3600, clock=time.monotonic):
+        self.engine = engine or RiskEngine()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._columns = ()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_version(self):
+        version = self.engine.version
+        if version != self._version:
+            if self._version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+            self._columns = tuple(self.engine.features)
+        return version
+
+    def key(self, profile):
+        """Cache key for `profile` under the current engine version."""
+        with self._lock:
+            version = self._check_version()
+        return self._key(profile, version)
+
+    def _key(self, profile, version):
+        return (version,) + tuple(_normalize(profile[c]) if c in profile else _ABSENT for c in self._columns)
+
+    def evaluate(self, profile, explain=True):
+        """Same output as `RiskEngine.evaluate`, served from the cache when possible."""
+        with self._lock:
+            version = self._check_version()
+            key = self._key(profile, version)
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is not None:
+                expires, result = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(result, explain)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        result = self.engine.evaluate(profile, explain=True)
+        with self._lock:
+            # Do not store a result computed under rules that were swapped meanwhile.
+            if self.engine.version == version:
+                self._entries[key] = (now + self.ttl_seconds, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return _copy(result, explain)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _copy(result, explain):
+    """Callers get their own dict, so mutating a result cannot corrupt the cache."""
+    out = dict(result)
+    if explain:
+        out["drivers"] = [dict(d) for d in result["drivers"]]
+    else:
+        del out["drivers"]
+    return out
@@ -0,0 +1,60 @@
+import pandas as pd
+
+
+class DriverMatrix:
+    """
+    Columnar risk-driver explanations for a scored batch.
+
+    Instead of a list of driver dicts per row, a batch keeps two compact
+    (n_rows x n_factors) matrices in rule order: `impacts` (int16 score
+    points) and `slots` (int8 index of the bin/category that fired). The
+    factor names are a single shared vocabulary. Human-readable driver dicts
+    are only built when `drivers()` is called for a specific row. `values`
+    keeps the raw inputs of the linear rules (`rules.linear` order) for
+    their "{value}" texts.
+    """
+
+    def __init__(self, rules, slots, impacts, index=None, values=None):
+        self.rules = rules
+        self.slots = slots
+        self.impacts = impacts
+        self.values = values
+        self.index = pd.RangeIndex(len(impacts)) if index is None else index
+
+    @property
+    def factors(self):
+        return self.rules.factors
+
+    @property
+    def nbytes(self):
+        return self.slots.nbytes + self.impacts.nbytes + (self.values.nbytes if self.values is not None else 0)
+
+    def __len__(self):
+        return len(self.impacts)
+
+    def drivers(self, i):
+        """Builds the `evaluate`-style driver list for the row at position `i`."""
+        drivers = []
+        for j, rule in enumerate(self.rules.rules):
+            slot = int(self.slots[i, j])
+            impact = int(self.impacts[i, j])
+            value = None
+            if rule.kind == "linear":
+                if self.values is not None:
+                    value = float(self.values[i, self.rules.linear.index(j)])
+                else:  # rebuilt from the rounded impact: exact for integer inputs only
+                    value = impact / rule.per_unit
+                value = int(value) if value.is_integer() else value
+            desc = rule.describe(slot, value)
+            if desc is not None:
+                drivers.append({"factor": rule.factor, "impact": impact, "desc": desc})
+        return drivers
+
+    def drivers_for(self, label):
+        """Same as `drivers`, looked up by index label of the scored frame."""
+        return self.drivers(self.index.get_loc(label))
+
+    def to_frame(self):
+        """Impact matrix as a DataFrame with one column per factor."""
+        return pd.DataFrame(self.impacts, index=self.index, columns=self.factors)
+
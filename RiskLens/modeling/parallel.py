@@ -0,0 +1,216 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from RiskLens.modeling.drivers import DriverMatrix
+from RiskLens.modeling.risk_engine import RiskEngine
+
+RESULT_DTYPES = {
+    "risk_score": np.int64,
+    "prob_default": np.float64,
+    "prob_repayment": np.float64,
+    "rec_limit": np.int64,
+    "min_limit": np.int64,
+    "max_limit": np.int64,
+}
+
+
+class SharedArrays:
+    """
+    A set of named NumPy arrays backed by shared memory blocks.
+
+    Only the small `spec` (block names, dtypes, shapes and category labels)
+    crosses the process boundary; workers map the same blocks, so column
+    data is never pickled.
+    """
+
+    def __init__(self, spec, blocks, owner):
+        self.spec = spec
+        self._blocks = blocks
+        self._owner = owner
+        self.arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+            for name, (_, dtype, shape, _) in spec.items()
+        }
+
+    @classmethod
+    def allocate(cls, layout):
+        """`layout` maps name -> (dtype, shape, categories or None)."""
+        spec, blocks = {}, {}
+        for name, (dtype, shape, categories) in layout.items():
+            nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            block = shared_memory.SharedMemory(create=True, size=nbytes)
+            blocks[name] = block
+            spec[name] = (block.name, np.dtype(dtype).str, shape, categories)
+        return cls(spec, blocks, owner=True)
+
+    @classmethod
+    def from_frame(cls, df, columns):
+        """Copies `columns` of `df` into shared memory; strings become codes + categories."""
+        layout, values = {}, {}
+        for name in columns:
+            col = df[name]
+            kind = pd.api.types.infer_dtype(col, skipna=True) if col.dtype == object else None
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                codes, categories = col.cat.codes.to_numpy(), list(col.cat.categories)
+            elif kind == "boolean":
+                # Keep Python truthiness (None -> False) that the rules rely on.
+                codes, categories = col.to_numpy().astype(bool), None
+            elif kind in ("integer", "floating", "mixed-integer-float"):
+                codes, categories = col.to_numpy(dtype=np.float64, na_value=np.nan), None
+            elif col.dtype == object or pd.api.types.is_string_dtype(col.dtype):
+                codes, uniques = pd.factorize(col)
+                categories = list(uniques)
+            else:
+                codes, categories = col.to_numpy(), None
+            layout[name] = (codes.dtype, codes.shape, categories)
+            values[name] = codes
+        shared = cls.allocate(layout)
+        for name, arr in values.items():
+            shared.arrays[name][:] = arr
+        return shared
+
+    @classmethod
+    def attach(cls, spec):
+        blocks = {name: shared_memory.SharedMemory(name=s[0]) for name, s in spec.items()}
+        return cls(spec, blocks, owner=False)
+
+    def frame(self, start, stop):
+        """Zero-copy DataFrame view of rows [start, stop) (categoricals rebuilt from codes)."""
+        data = {}
+        for name, arr in self.arrays.items():
+            categories = self.spec[name][3]
+            view = arr[start:stop]
+            data[name] = view if categories is None else pd.Categorical.from_codes(view, categories=categories)
+        return pd.DataFrame(data, copy=False)
+
+    def close(self):
+        self.arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+
+
+# --- Worker side ---
+_worker = {}
+
+
+def _init_worker(engine, input_spec, output_spec):
+    _worker["engine"] = engine
+    _worker["inputs"] = SharedArrays.attach(input_spec) if input_spec else None
+    _worker["outputs"] = SharedArrays.attach(output_spec)
+
+
+def _write_results(out, start, results, matrix):
+    for name in RESULT_DTYPES:
+        out[name][start:start + len(results)] = results[name].to_numpy()
+    if matrix is not None:
+        out["slots"][start:start + len(results)] = matrix.slots
+        out["impacts"][start:start + len(results)] = matrix.impacts
+        out["values"][start:start + len(results)] = matrix.values
+
+
+def _score_range(task):
+    start, stop, explain = task
+    df = _worker["inputs"].frame(start, stop)
+    scored = _worker["engine"].evaluate_batch(df, explain=explain)
+    results, matrix = scored if explain else (scored, None)
+    _write_results(_worker["outputs"].arrays, start, results, matrix)
+    return stop - start
+
+
+def _score_row_group(task):
+    path, row_group, start, columns, explain = task
+    import pyarrow.parquet as pq
+
+    table = pq.ParquetFile(path).read_row_group(row_group, columns=columns)
+    scored = _worker["engine"].evaluate_batch(table.to_pandas(), explain=explain)
+    results, matrix = scored if explain else (scored, None)
+    _write_results(_worker["outputs"].arrays, start, results, matrix)
+    return table.num_rows
+
+
+# --- Parent side ---
+def _parquet_tasks(path, columns, explain):
+    import pyarrow.parquet as pq
+
+    files = sorted(
+        os.path.join(path, f) for f in os.listdir(path) if f.endswith(".parquet")
+    ) if os.path.isdir(path) else [path]
+    tasks, offset = [], 0
+    for file in files:
+        meta = pq.ParquetFile(file).metadata
+        schema = set(meta.schema.names)
+        present = [c for c in columns if c in schema]
+        for rg in range(meta.num_row_groups):
+            tasks.append((file, rg, offset, present, explain))
+            offset += meta.row_group(rg).num_rows
+    return tasks, offset
+
+
+def _output_layout(n, n_rules, n_linear, explain):
+    layout = {name: (dtype, (n,), None) for name, dtype in RESULT_DTYPES.items()}
+    if explain:
+        layout["slots"] = (np.int8, (n, n_rules), None)
+        layout["impacts"] = (np.int16, (n, n_rules), None)
+        layout["values"] = (np.float64, (n, n_linear), None)
+    return layout
+
+
+def score_parallel(data, engine=None, workers=None, chunk_size=250000, explain=False):
+    """
+    Scores a large portfolio across CPU cores.
+
+    `data` is a DataFrame or the path to a Parquet file / directory of Parquet
+    files. A DataFrame's scoring columns are copied once into shared memory
+    and workers score `chunk_size` row ranges in place; Parquet inputs are
+    read by the workers themselves, one row group per task. Results are
+    written into shared output arrays at each chunk's offset, so row order
+    is preserved. Returns the same frame as `RiskEngine.evaluate_batch`
+    (plus the DriverMatrix with `explain=True`).
+    """
+    engine = engine or RiskEngine()
+    workers = workers or os.cpu_count() or 1
+    columns = list(dict.fromkeys(engine.rules.features + ["fin_declared_income", "fin_existing_emi"]))
+    n_rules = len(engine.rules.rules)
+
+    inputs = None
+    if isinstance(data, pd.DataFrame):
+        index = data.index
+        if workers == 1:
+            return engine.evaluate_batch(data, explain=explain)
+        present = [c for c in columns if c in data]
+        inputs = SharedArrays.from_frame(data, present)
+        n = len(data)
+        tasks = [(s, min(s + chunk_size, n), explain) for s in range(0, n, chunk_size)]
+        func = _score_range
+    else:
+        tasks, n = _parquet_tasks(str(data), columns, explain)
+        index = pd.RangeIndex(n)
+        func = _score_row_group
+
+    outputs = SharedArrays.allocate(_output_layout(n, n_rules, len(engine.rules.linear), explain))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(engine, inputs.spec if inputs else None, outputs.spec),
+        ) as pool:
+            scored = sum(pool.map(func, tasks))
+        if scored != n:
+            raise RuntimeError(f"Scored {scored} of {n} rows")
+        arrays = outputs.arrays
+        results = pd.DataFrame({name: arrays[name].copy() for name in RESULT_DTYPES}, index=index)
+        matrix = None
+        if explain:
+            matrix = DriverMatrix(engine.rules, arrays["slots"].copy(), arrays["impacts"].copy(), index,
+                                  arrays["values"].copy())
+    finally:
+        outputs.close()
+        if inputs is not None:
+            inputs.close()
+    return (results, matrix) if explain else results
@@ -1,84 +1,105 @@
 import numpy as np
+import pandas as pd
+
+from RiskLens.instrumentation import batch_rows, instrumented
+from RiskLens.modeling.drivers import DriverMatrix
+from RiskLens.modeling.rules import RuleSet
+
+# Bump when the score clamping, PD mapping or limit formulas below change.
+ENGINE_VERSION = "1"
+
+
+# --- Vectorized score -> PD -> limit helpers (shared with the model engine) ---
+def score_to_pd(score):
+    """Heuristic PD for clamped scores: the piecewise mapping `evaluate` uses."""
+    score = np.asarray(score, dtype=float)
+    return np.where(
+        score < 30,
+        0.4 + (30 - score) / 100,
+        np.where(score > 80, 0.01, 0.05 + (80 - score) * 0.007),
+    )
+
+
+def pd_to_score(prob_default):
+    """
+    Inverse of `score_to_pd` for model PDs, clamped to 0..100. The flat
+    0.01 PD band above score 80 is spread linearly over PDs 0.05..0.01.
+    """
+    p = np.asarray(prob_default, dtype=float)
+    score = np.where(
+        p > 0.4,
+        30 - (p - 0.4) * 100,
+        np.where(p >= 0.05, 80 - (p - 0.05) / 0.007, 80 + (0.05 - p) / 0.04 * 20),
+    )
+    return np.clip(score, 0, 100)
+
+
+def credit_limits(score, income, emi):
+    """(rec_limit, min_limit, max_limit) from disposable income and the score multiplier."""
+    disposable_income = (income / 12) - emi
+    positive = disposable_income >= 0
+    multiplier = np.maximum(1.0, score / 10)
+    rec_limit = np.where(positive, disposable_income * multiplier, 0)
+    min_limit = np.where(positive, disposable_income, 0)
+    max_limit = np.where(positive, np.maximum(min_limit, disposable_income * (multiplier * 1.5)), 0)
+    return rec_limit, min_limit, max_limit
+
+
+def score_results(score, prob_default, income, emi, index=None):
+    """The `evaluate_batch` result frame, with `evaluate`'s rounding and truncation."""
+    rec_limit, min_limit, max_limit = credit_limits(score, income, emi)
+    return pd.DataFrame(
+        {
+            "risk_score": np.trunc(score).astype(np.int64),
+            "prob_default": np.round(prob_default, 3),
+            "prob_repayment": np.round(1.0 - prob_default, 3),
+            "rec_limit": np.trunc(rec_limit).astype(np.int64),
+            "min_limit": np.trunc(min_limit).astype(np.int64),
+            "max_limit": np.trunc(max_limit).astype(np.int64),
+        },
+        index=index,
+    )
+
 
 class RiskEngine:
-    def __init__(self):
-        pass
+    def __init__(self, rules=None):
+        self.load_rules(rules)
+
+    @property
+    def version(self):
+        """Identifies everything that determines a score: engine code and rule table."""
+        return f"{ENGINE_VERSION}-{self.rules.version}"
+
+    @property
+    def features(self):
+        """Every profile field the score depends on: rule inputs plus income and EMI for limits."""
+        return list(dict.fromkeys(self.rules.features + ["fin_declared_income", "fin_existing_emi"]))
 
-    def evaluate(self, profile):
+    def load_rules(self, rules=None):
+        """
+        Compiles and installs a rule table: a `RuleSet`, a rules dict, or the
+        path to a JSON rule file. `None` restores the built-in defaults.
+        The swap is a single attribute assignment, so it is safe to call on a
+        live engine.
+        """
+        if isinstance(rules, RuleSet):
+            compiled = rules
+        elif isinstance(rules, dict) or rules is None:
+            compiled = RuleSet(rules)
+        else:
+            compiled = RuleSet.from_file(rules)
+        self.rules = compiled
+        return compiled
+
+    @instrumented("modeling.evaluate")
+    def evaluate(self, profile, explain=True):
         """
         Evaluates a customer profile and returns risk metrics.
+        With `explain=False` the "drivers" list is not built.
         """
-        score = 50  # Base score
-        drivers = []
-
-        # --- 1. Identity & Profile (Base Trust) ---
-        if profile.get("id_res_status") == "Indian":
-            score += 5
-            drivers.append({"factor": "Residential Status", "impact": +5, "desc": "Resident Indian"})
-        
-        if profile.get("prof_geo_risk_score") == "High":
-            score -= 10
-            drivers.append({"factor": "Geo Risk", "impact": -10, "desc": "High Risk Location"})
-        
-        # --- 2. Financial Capacity ---
+        score, drivers = self.rules.evaluate_one(profile, explain)
         income = profile.get("fin_declared_income", 0)
         emi = profile.get("fin_existing_emi", 0)
-        lti = profile.get("fin_lti_ratio", 0)
-        
-        # Income Tiers (Annual)
-        if income > 1500000:
-            score += 15
-            drivers.append({"factor": "Income Level", "impact": +15, "desc": "High Income (>15L)"})
-        elif income > 1000000:
-            score += 10
-            drivers.append({"factor": "Income Level", "impact": +10, "desc": "Mid-High Income (>10L)"})
-        elif income > 500000:
-            score += 5
-            drivers.append({"factor": "Income Level", "impact": +5, "desc": "Middle Income (>5L)"})
-        elif income < 300000:
-            score -= 10
-            drivers.append({"factor": "Income Level", "impact": -10, "desc": "Low Income (<3L)"})
-
-        if profile.get("fin_documented_income_verified"):
-            score += 10
-            drivers.append({"factor": "Income Verification", "impact": +10, "desc": "Documented Income"})
-        else:
-            score -= 5
-            drivers.append({"factor": "Income Verification", "impact": -5, "desc": "Declared Only"})
-
-        if lti > 0.6:
-            score -= 15
-            drivers.append({"factor": "Loan-to-Income", "impact": -15, "desc": "High Debt Burden (>60%)"})
-        elif lti < 0.3:
-            score += 10
-            drivers.append({"factor": "Loan-to-Income", "impact": +10, "desc": "Low Debt Burden (<30%)"})
-
-        # --- 3. Employment Stability ---
-        if profile.get("emp_employer_type") in ["Govt", "PSU"]:
-            score += 10
-            drivers.append({"factor": "Employment", "impact": +10, "desc": "Govt/PSU Employer"})
-        elif profile.get("emp_employer_type") == "Unemployed":
-            score -= 20
-            drivers.append({"factor": "Employment", "impact": -20, "desc": "Unemployed"})
-
-        # --- 4. Behavioral & History ---
-        cibil = profile.get("ext_cibil_score", 0)
-        if cibil >= 750:
-            score += 20
-            drivers.append({"factor": "CIBIL Score", "impact": +20, "desc": "Excellent Credit Score"})
-        elif cibil < 650:
-            score -= 20
-            drivers.append({"factor": "CIBIL Score", "impact": -20, "desc": "Poor Credit Score"})
-
-        bounces = profile.get("beh_past_emi_bounces", 0)
-        if bounces > 0:
-            impact = -5 * bounces
-            score += impact
-            drivers.append({"factor": "Payment History", "impact": impact, "desc": f"{bounces} EMI Bounces"})
-
-        if profile.get("ext_previous_npa"):
-            score -= 50
-            drivers.append({"factor": "Critical Flag", "impact": -50, "desc": "Previous NPA"})
 
         # --- Final Score Clamping ---
         score = max(0, min(100, score))
@@ -111,12 +132,43 @@ class RiskEngine:
             min_limit = disposable_income
             max_limit = max(min_limit, disposable_income * (multiplier * 1.5))
 
-        return {
+        result = {
             "risk_score": int(score),
             "prob_default": round(prob_default, 3),
             "prob_repayment": round(prob_repayment, 3),
             "rec_limit": int(rec_limit),
             "min_limit": int(min_limit),
             "max_limit": int(max_limit),
-            "drivers": drivers
         }
+        if explain:
+            result["drivers"] = drivers
+        return result
+
+    @instrumented("modeling.evaluate_batch", rows=batch_rows)
+    def evaluate_batch(self, df, explain=False):
+        """
+        Vectorized counterpart of `evaluate` for a whole DataFrame of profiles.
+
+        Expects the column schema produced by `RiskProfileGenerator.generate_batch`
+        (missing columns fall back to the same defaults `evaluate` uses) and returns
+        a DataFrame aligned to `df.index` with risk_score, prob_default,
+        prob_repayment, rec_limit, min_limit and max_limit. Results match
+        `evaluate` row for row.
+
+        With `explain=True` returns (results, DriverMatrix): the per-factor
+        impacts as a compact int16 matrix, from which `evaluate`-style driver
+        dicts can be built on demand for individual rows.
+        """
+        if explain:
+            score, slots, impacts, values = self.rules.evaluate_frame(df, explain=True)
+        else:
+            score = self.rules.evaluate_frame(df)
+        n = len(df)
+        income = df["fin_declared_income"].to_numpy(dtype=float) if "fin_declared_income" in df else np.zeros(n)
+        emi = df["fin_existing_emi"].to_numpy(dtype=float) if "fin_existing_emi" in df else np.zeros(n)
+
+        score = np.clip(score, 0, 100)
+        results = score_results(score, score_to_pd(score), income, emi, df.index)
+        if explain:
+            return results, DriverMatrix(self.rules, slots, impacts, df.index, values)
+        return results
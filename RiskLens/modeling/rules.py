@@ -0,0 +1,271 @@
+import bisect
+import hashlib
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+# Declarative scoring rules. Each rule reads one profile feature and maps it to
+# a score impact; a rule that produces a `desc` also produces a risk driver.
+#
+#   bins      ordered bins; every bin but the last closes with either
+#             "below" (value < x) or "upto" (value <= x)
+#   category  sets of values; values outside every set have no impact
+#   flag      truthiness of the feature, with "true"/"false" outcomes
+#   linear    impact = per_unit * value whenever value > "above"
+#
+# `default` is used when the feature is missing from the profile, matching the
+# `profile.get(...)` defaults of the original hard-coded engine.
+DEFAULT_RULES = {
+    "base_score": 50,
+    "rules": [
+        {
+            "factor": "Residential Status", "feature": "id_res_status", "type": "category",
+            "categories": [{"values": ["Indian"], "impact": 5, "desc": "Resident Indian"}],
+        },
+        {
+            "factor": "Geo Risk", "feature": "prof_geo_risk_score", "type": "category",
+            "categories": [{"values": ["High"], "impact": -10, "desc": "High Risk Location"}],
+        },
+        {
+            "factor": "Income Level", "feature": "fin_declared_income", "type": "bins", "default": 0,
+            "bins": [
+                {"below": 300000, "impact": -10, "desc": "Low Income (<3L)"},
+                {"upto": 500000, "impact": 0},
+                {"upto": 1000000, "impact": 5, "desc": "Middle Income (>5L)"},
+                {"upto": 1500000, "impact": 10, "desc": "Mid-High Income (>10L)"},
+                {"impact": 15, "desc": "High Income (>15L)"},
+            ],
+        },
+        {
+            "factor": "Income Verification", "feature": "fin_documented_income_verified", "type": "flag",
+            "true": {"impact": 10, "desc": "Documented Income"},
+            "false": {"impact": -5, "desc": "Declared Only"},
+        },
+        {
+            "factor": "Loan-to-Income", "feature": "fin_lti_ratio", "type": "bins", "default": 0,
+            "bins": [
+                {"below": 0.3, "impact": 10, "desc": "Low Debt Burden (<30%)"},
+                {"upto": 0.6, "impact": 0},
+                {"impact": -15, "desc": "High Debt Burden (>60%)"},
+            ],
+        },
+        {
+            "factor": "Employment", "feature": "emp_employer_type", "type": "category",
+            "categories": [
+                {"values": ["Govt", "PSU"], "impact": 10, "desc": "Govt/PSU Employer"},
+                {"values": ["Unemployed"], "impact": -20, "desc": "Unemployed"},
+            ],
+        },
+        {
+            "factor": "CIBIL Score", "feature": "ext_cibil_score", "type": "bins", "default": 0,
+            "bins": [
+                {"below": 650, "impact": -20, "desc": "Poor Credit Score"},
+                {"below": 750, "impact": 0},
+                {"impact": 20, "desc": "Excellent Credit Score"},
+            ],
+        },
+        {
+            "factor": "Payment History", "feature": "beh_past_emi_bounces", "type": "linear", "default": 0,
+            "above": 0, "per_unit": -5, "desc": "{value} EMI Bounces",
+        },
+        {
+            "factor": "Critical Flag", "feature": "ext_previous_npa", "type": "flag",
+            "true": {"impact": -50, "desc": "Previous NPA"},
+        },
+    ],
+}
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class CompiledRule:
+    """
+    One rule compiled into lookup arrays.
+
+    Every row is first mapped to an integer slot (bin, category set, flag state
+    or linear on/off); `impacts[slot]` and `descs[slot]` then give the score
+    impact and driver text. Slots with a `None` desc never produce a driver.
+    """
+
+    def __init__(self, spec):
+        self.factor = spec["factor"]
+        self.feature = spec["feature"]
+        self.kind = spec["type"]
+        self.default = spec.get("default")
+        impacts, descs = [], []
+
+        if self.kind == "bins":
+            # Edges closed with "upto" count as passed when value > edge,
+            # "below" edges when value >= edge; the bin is the number passed.
+            self.gt_edges, self.ge_edges = [], []
+            for i, b in enumerate(spec["bins"]):
+                if i < len(spec["bins"]) - 1:
+                    if "upto" in b:
+                        self.gt_edges.append(float(b["upto"]))
+                    elif "below" in b:
+                        self.ge_edges.append(float(b["below"]))
+                    else:
+                        raise ValueError(f"Rule '{self.factor}': bin {i} needs 'below' or 'upto'")
+                impacts.append(b.get("impact", 0))
+                descs.append(b.get("desc"))
+            edges = [b.get("upto", b.get("below")) for b in spec["bins"][:-1]]
+            if edges != sorted(edges):
+                raise ValueError(f"Rule '{self.factor}': bin edges must be increasing")
+            self._gt = np.array(self.gt_edges)
+            self._ge = np.array(self.ge_edges)
+        elif self.kind == "category":
+            self.lookup = {}
+            for slot, group in enumerate(spec["categories"]):
+                for value in group["values"]:
+                    self.lookup[value] = slot
+                impacts.append(group.get("impact", 0))
+                descs.append(group.get("desc"))
+        elif self.kind == "flag":
+            for key in ("false", "true"):
+                outcome = spec.get(key, {})
+                impacts.append(outcome.get("impact", 0))
+                descs.append(outcome.get("desc"))
+        elif self.kind == "linear":
+            self.above = spec.get("above", 0)
+            self.per_unit = spec["per_unit"]
+            impacts += [0, self.per_unit]
+            descs += [None, spec.get("desc")]
+        else:
+            raise ValueError(f"Rule '{self.factor}': unknown rule type '{self.kind}'")
+
+        # Trailing slot: missing value / no matching category, no impact.
+        impacts.append(0)
+        descs.append(None)
+        self.missing_slot = len(impacts) - 1
+        self.impacts = np.array(impacts, dtype=np.int16)
+        self.descs = descs
+        self._impacts = [int(i) for i in impacts]
+
+    # --- Scalar path ---
+    def slot_one(self, value):
+        if self.kind == "category":
+            try:
+                return self.lookup.get(value, self.missing_slot)
+            except TypeError:  # unhashable
+                return self.missing_slot
+        if self.kind == "flag":
+            return 1 if value else 0
+        if _is_missing(value):
+            return self.missing_slot
+        if self.kind == "bins":
+            return bisect.bisect_left(self.gt_edges, value) + bisect.bisect_right(self.ge_edges, value)
+        return 1 if value > self.above else 0
+
+    def impact_one(self, slot, value):
+        if self.kind == "linear":
+            return self.per_unit * value if slot == 1 else 0
+        return self._impacts[slot]
+
+    def describe(self, slot, value):
+        desc = self.descs[slot]
+        if desc is None or self.kind != "linear":
+            return desc
+        return desc.format(value=value)
+
+    # --- Batch path ---
+    def slots(self, values):
+        """Maps an array (or pandas Series) of feature values to slot indices."""
+        if self.kind == "category":
+            series = values if isinstance(values, pd.Series) else pd.Series(values)
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                table = np.array(
+                    [self.lookup.get(c, self.missing_slot) for c in series.cat.categories] + [self.missing_slot],
+                    dtype=np.int8,
+                )
+                return table[series.cat.codes.to_numpy()]
+            mapped = series.map(self.lookup).to_numpy(dtype=float, na_value=np.nan)
+            return np.where(np.isnan(mapped), self.missing_slot, mapped).astype(np.int8)
+
+        values = np.asarray(values)
+        if self.kind == "flag":
+            return values.astype(bool).astype(np.int8)
+
+        values = values.astype(float)
+        if self.kind == "bins":
+            slots = np.searchsorted(self._gt, values, side="left") + np.searchsorted(self._ge, values, side="right")
+        else:
+            slots = values > self.above
+        return np.where(np.isnan(values), self.missing_slot, slots).astype(np.int8)
+
+    def impacts_for(self, slots, values):
+        if self.kind == "linear":
+            return np.where(slots == 1, self.per_unit * np.asarray(values, dtype=float), 0)
+        return self.impacts[slots]
+
+
+class RuleSet:
+    """
+    A compiled, immutable rule table.
+
+    Built once from a dict (or a JSON rule file) and shared by the scalar and
+    batch scoring paths. `version` is a content hash of the source table.
+    """
+
+    def __init__(self, spec=None):
+        spec = DEFAULT_RULES if spec is None else spec
+        self.base_score = spec.get("base_score", 50)
+        self.rules = [CompiledRule(r) for r in spec["rules"]]
+        self.factors = [r.factor for r in self.rules]
+        self.features = list(dict.fromkeys(r.feature for r in self.rules))
+        # Positions of the linear rules, whose drivers quote the raw input value.
+        self.linear = [j for j, r in enumerate(self.rules) if r.kind == "linear"]
+        canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def evaluate_one(self, profile, explain=True):
+        """Returns (raw_score, drivers) for a single profile dict; drivers is None unless `explain`."""
+        score = self.base_score
+        drivers = [] if explain else None
+        for rule in self.rules:
+            value = profile.get(rule.feature, rule.default)
+            slot = rule.slot_one(value)
+            impact = rule.impact_one(slot, value)
+            score += impact
+            if explain:
+                desc = rule.describe(slot, value)
+                if desc is not None:
+                    drivers.append({"factor": rule.factor, "impact": impact, "desc": desc})
+        return score, drivers
+
+    def evaluate_frame(self, df, explain=False):
+        """
+        Returns the raw (unclamped) float score for every row of `df`.
+
+        With `explain=True` returns (score, slots, impacts, values) instead,
+        where slots (int8) and impacts (int16) are (n_rows x n_rules) matrices
+        in rule order and values (float64, n_rows x len(self.linear)) holds
+        the inputs of the linear rules, which their driver texts quote.
+        """
+        n = len(df)
+        score = np.full(n, float(self.base_score))
+        if explain:
+            slots = np.empty((n, len(self.rules)), dtype=np.int8)
+            impacts = np.empty((n, len(self.rules)), dtype=np.int16)
+            linear_values = np.full((n, len(self.linear)), np.nan)
+        for j, rule in enumerate(self.rules):
+            values = df[rule.feature] if rule.feature in df else np.full(n, rule.default, dtype=object)
+            rule_slots = rule.slots(values)
+            rule_impacts = rule.impacts_for(rule_slots, values)
+            score += rule_impacts
+            if explain:
+                slots[:, j] = rule_slots
+                impacts[:, j] = np.clip(np.rint(rule_impacts), -32768, 32767)
+                if rule.kind == "linear":
+                    linear_values[:, self.linear.index(j)] = np.where(rule_slots == 1, np.asarray(values, dtype=float), np.nan)
+        if explain:
+            return score, slots, impacts, linear_values
+        return score
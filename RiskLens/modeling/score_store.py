@@ -0,0 +1,217 @@
+# Versioned score snapshots: memory-mapped columnar arrays with a sorted account-id index
+
+import bisect
+import datetime
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+RESULT_COLUMNS = ["risk_score", "prob_default", "prob_repayment", "rec_limit", "min_limit", "max_limit"]
+_MANIFEST = "manifest.json"
+_META = "meta.json"
+
+
+def _as_date(value):
+    if value is None:
+        return datetime.date.today().isoformat()
+    return pd.Timestamp(value).date().isoformat()
+
+
+def _id_array(ids):
+    """Account ids as int64, or as fixed-width UTF-8 bytes for string ids (PANs, account numbers)."""
+    ids = np.asarray(ids)
+    if ids.dtype.kind in "iu":
+        return ids.astype(np.int64)
+    if ids.dtype.kind == "S":
+        return ids
+    return np.char.encode(ids.astype(str), "utf-8")
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class ScoreSnapshot:
+    """
+    One scoring run, read-only. Every column is a `.npy` memory map sorted
+    by account id, so opening a snapshot only reads the array headers and a
+    lookup is a binary search over the id column plus one read per column:
+    O(log n), with no copy of the arrays into RAM. Pages are shared through
+    the OS cache by every process that opens the same run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, _META)) as f:
+            self.meta = json.load(f)
+        self.ids = np.load(os.path.join(path, "ids.npy"), mmap_mode="r")
+        self.columns = {c: np.load(os.path.join(path, f"{c}.npy"), mmap_mode="r") for c in self.meta["columns"]}
+        self.impacts = None
+        if self.meta["factors"]:
+            self.impacts = np.load(os.path.join(path, "impacts.npy"), mmap_mode="r")
+
+    @property
+    def run_id(self):
+        return self.meta["run_id"]
+
+    @property
+    def as_of(self):
+        return self.meta["as_of"]
+
+    @property
+    def version(self):
+        return self.meta["version"]
+
+    @property
+    def factors(self):
+        return self.meta["factors"]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def locate(self, ids):
+        """Row positions of `ids` and a mask of which were found (positions of missing ids are meaningless)."""
+        # Not cast to the stored width: a longer query id must not match its truncated prefix.
+        ids = _id_array(np.atleast_1d(ids))
+        if not len(self.ids):
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return pos, self.ids[pos] == ids
+
+    def get(self, account_id):
+        """Scoring output of one account as a dict (with an "impacts" factor dict if stored), or None."""
+        key = account_id.encode() if isinstance(account_id, str) else account_id
+        i = int(np.searchsorted(self.ids, key))
+        if i == len(self.ids) or self.ids[i] != key:
+            return None
+        result = {c: arr[i].item() for c, arr in self.columns.items()}
+        if self.impacts is not None:
+            result["impacts"] = dict(zip(self.factors, self.impacts[i].tolist()))
+        return result
+
+    def lookup(self, ids):
+        """Scoring output of many accounts as a DataFrame indexed by account id (unknown ids are left out)."""
+        pos, found = self.locate(ids)
+        pos = pos[found]
+        frame = pd.DataFrame({c: arr[pos] for c, arr in self.columns.items()}, index=self._labels(self.ids[pos]))
+        if self.impacts is not None:
+            frame = frame.join(pd.DataFrame(self.impacts[pos], index=frame.index, columns=self.factors))
+        return frame
+
+    def frame(self):
+        """The whole run as a DataFrame (this one does read every column into memory)."""
+        return self.lookup(self.ids)
+
+    def _labels(self, ids):
+        if ids.dtype.kind == "S":
+            return pd.Index(np.char.decode(ids, "utf-8"), name=self.meta["id_column"])
+        return pd.Index(ids, name=self.meta["id_column"])
+
+
+class ScoreStore:
+    """
+    Directory of versioned score snapshots, one per scoring run.
+
+    `write` stores a run's output (account ids, scores, PD, limits and
+    optionally the driver impact matrix) as id-sorted columnar `.npy` files
+    and records it in a small manifest with its as-of date and engine
+    version. Opening the store reads only the manifest; snapshots are
+    memory-mapped on first use. `as_of(date)` is the latest run on or before
+    a date, and `score_as_of(account_id, date)` the account's latest score
+    on or before it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.join(path, "runs"), exist_ok=True)
+        manifest = os.path.join(path, _MANIFEST)
+        self.runs = []
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                self.runs = json.load(f)["runs"]
+        self._open = {}
+
+    def write(self, ids, results, as_of=None, version=None, impacts=None, id_column="account_id"):
+        """
+        Stores one run and returns its snapshot. `results` is an
+        `evaluate_batch` frame aligned with `ids`; `impacts` an optional
+        (n_rows x n_factors) frame such as `DriverMatrix.to_frame()`.
+        """
+        ids = _id_array(ids)
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        if len(sorted_ids) > 1 and (sorted_ids[1:] == sorted_ids[:-1]).any():
+            raise ValueError("Account ids must be unique within a scoring run")
+
+        run_id = f"run-{len(self.runs) + 1:05d}"
+        final = os.path.join(self.path, "runs", run_id)
+        tmp = final + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        np.save(os.path.join(tmp, "ids.npy"), sorted_ids)
+        columns = [c for c in RESULT_COLUMNS if c in results] + [c for c in results if c not in RESULT_COLUMNS]
+        for c in columns:
+            np.save(os.path.join(tmp, f"{c}.npy"), results[c].to_numpy()[order])
+        factors = []
+        if impacts is not None:
+            factors = [str(f) for f in impacts.columns]
+            np.save(os.path.join(tmp, "impacts.npy"), np.ascontiguousarray(impacts.to_numpy()[order]))
+
+        meta = {
+            "run_id": run_id,
+            "as_of": _as_date(as_of),
+            "version": version,
+            "rows": len(sorted_ids),
+            "id_column": id_column,
+            "columns": columns,
+            "factors": factors,
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        }
+        _write_json(os.path.join(tmp, _META), meta)
+        shutil.rmtree(final, ignore_errors=True)  # left over from a run that never reached the manifest
+        os.replace(tmp, final)
+
+        # The manifest is replaced atomically, so readers never see a half-written run.
+        self.runs.append(meta)
+        self.runs.sort(key=lambda m: (m["as_of"], m["run_id"]))
+        _write_json(os.path.join(self.path, _MANIFEST), {"runs": self.runs})
+        return self.snapshot(run_id)
+
+    def snapshot(self, run_id=None):
+        """The snapshot with `run_id` (the latest run by as-of date by default)."""
+        if run_id is None:
+            if not self.runs:
+                return None
+            run_id = self.runs[-1]["run_id"]
+        if run_id not in self._open:
+            if not any(m["run_id"] == run_id for m in self.runs):
+                raise KeyError(f"Unknown scoring run '{run_id}'")
+            self._open[run_id] = ScoreSnapshot(os.path.join(self.path, "runs", run_id))
+        return self._open[run_id]
+
+    def _runs_until(self, date):
+        cut = bisect.bisect_right([m["as_of"] for m in self.runs], _as_date(date))
+        return self.runs[:cut]
+
+    def as_of(self, date):
+        """Latest snapshot dated on or before `date`, or None."""
+        runs = self._runs_until(date)
+        return self.snapshot(runs[-1]["run_id"]) if runs else None
+
+    def score_as_of(self, account_id, date):
+        """
+        The account's scoring output from the latest run on or before `date`
+        that scored it (with "run_id" and "as_of" added), or None. Runs that
+        cover the whole portfolio answer in a single binary search.
+        """
+        for meta in reversed(self._runs_until(date)):
+            result = self.snapshot(meta["run_id"]).get(account_id)
+            if result is not None:
+                return dict(result, run_id=meta["run_id"], as_of=meta["as_of"])
+        return None
@@ -0,0 +1,115 @@
+# ASGI scoring service: `uvicorn RiskLens.serving.app:app`
+
+import json
+import os
+
+from RiskLens import instrumentation
+from RiskLens.modeling.risk_engine import RiskEngine
+from RiskLens.serving.batcher import MicroBatcher
+
+_JSON_HEADERS = [(b"content-type", b"application/json")]
+_PROMETHEUS_HEADERS = [(b"content-type", b"text/plain; version=0.0.4")]
+
+
+class ScoringApp:
+    """
+    Minimal ASGI application for online scoring.
+
+    POST /score takes one profile (the dict the dashboard builds in
+    `render_input_screen`) and returns the `RiskEngine.evaluate` output.
+    GET /health reports the rules version and batching counters, GET
+    /metrics the instrumentation stage totals in Prometheus text (empty
+    unless RISKLENS_INSTRUMENT=1). The engine
+    is built once at lifespan startup (rules from `RISKLENS_RULES` if set)
+    and concurrent requests are micro-batched by `MicroBatcher`.
+    """
+
+    def __init__(self, engine=None, max_batch=4096, max_wait_ms=1.0, min_vector_batch=1024):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.min_vector_batch = min_vector_batch
+        self.batcher = None
+
+    async def startup(self):
+        if self.engine is None:
+            self.engine = RiskEngine(rules=os.environ.get("RISKLENS_RULES"))
+        self.batcher = MicroBatcher(self.engine, self.max_batch, self.max_wait_ms, self.min_vector_batch)
+        await self.batcher.start()
+
+    async def shutdown(self):
+        if self.batcher is not None:
+            await self.batcher.stop()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        method, path = scope["method"], scope["path"]
+        if path in ("/score", "/health") and method in ("POST", "GET") and self.batcher is None:
+            # The server did not run lifespan startup (or it has not finished).
+            return await _respond(send, 503, {"error": "Scoring engine is not started"})
+        if path == "/score" and method == "POST":
+            try:
+                profile = json.loads(await _read_body(receive))
+            except ValueError:
+                return await _respond(send, 400, {"error": "Body must be a JSON profile object"})
+            if not isinstance(profile, dict):
+                return await _respond(send, 400, {"error": "Body must be a JSON profile object"})
+            try:
+                result = await self.batcher.score(profile)
+            except Exception as e:
+                return await _respond(send, 422, {"error": f"Could not score profile: {e}"})
+            return await _respond(send, 200, result)
+        if path == "/health" and method == "GET":
+            return await _respond(send, 200, {"status": "ok", "rules_version": self.engine.rules.version,
+                                              **self.batcher.stats()})
+        if path == "/metrics" and method == "GET":
+            body = instrumentation.to_prometheus().encode()
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": _PROMETHEUS_HEADERS + [(b"content-length", str(len(body)).encode())]})
+            return await send({"type": "http.response.body", "body": body})
+        if path in ("/score", "/health", "/metrics"):
+            return await _respond(send, 405, {"error": "Method not allowed"})
+        return await _respond(send, 404, {"error": "Not found"})
+
+
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _respond(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": _JSON_HEADERS + [(b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_app(engine=None, max_batch=4096, max_wait_ms=1.0, min_vector_batch=1024):
+    return ScoringApp(engine, max_batch, max_wait_ms, min_vector_batch)
+
+
+app = create_app()
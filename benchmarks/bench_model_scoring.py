@@ -0,0 +1,49 @@
+# Batch inference throughput of the model-backed engine
+#
+#   python benchmarks/bench_model_scoring.py --rows 1000000 --train-rows 200000
+
+import argparse
+import time
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.model_engine import ModelRiskEngine, feature_matrix, synthetic_default_labels, train_model
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model scoring throughput")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--train-rows", type=int, default=200000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--backends", nargs="+", default=["xgboost", "lightgbm"])
+    args = parser.parse_args()
+
+    train = RiskProfileGenerator(seed=1).generate_batch(args.train_rows)
+    labels = synthetic_default_labels(train, seed=1)
+    df = RiskProfileGenerator(seed=2).generate_batch(args.rows)
+
+    X, t_encode = _timed(lambda: feature_matrix(df))
+    _, t_rules = _timed(lambda: RiskEngine().evaluate_batch(df))
+    print(f"rows={args.rows:,} features={X.shape[1]} matrix={X.nbytes / 1e6:.0f} MB")
+    print(f"{'feature_matrix':<28} {t_encode:8.3f}s {args.rows / t_encode:>14,.0f} rows/sec")
+    print(f"{'heuristic evaluate_batch':<28} {t_rules:8.3f}s {args.rows / t_rules:>14,.0f} rows/sec")
+
+    for backend in args.backends:
+        booster, t_train = _timed(lambda: train_model(train, labels, backend, args.rounds))
+        print(f"{backend}: trained {args.rounds} rounds on {args.train_rows:,} rows in {t_train:.1f}s")
+        for mode in ("model", "blend"):
+            engine = ModelRiskEngine(booster, mode=mode)
+            _, t_pred = _timed(lambda: engine.predict_pd(X))
+            _, t_batch = _timed(lambda: engine.evaluate_batch(df))
+            print(f"  {mode + ' predict_pd':<26} {t_pred:8.3f}s {args.rows / t_pred:>14,.0f} rows/sec")
+            print(f"  {mode + ' evaluate_batch':<26} {t_batch:8.3f}s {args.rows / t_batch:>14,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Scaling curve for parallel portfolio scoring: rows/sec per worker count
+#
+#   python benchmarks/bench_parallel_scoring.py --rows 2000000 --workers 1 2 4 8 16 32
+
+import argparse
+import os
+import time
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.parallel import score_parallel
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = args.workers or sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+    engine = RiskEngine()
+    df = RiskProfileGenerator(seed=args.seed).generate_batch(args.rows)
+
+    print(f"rows={args.rows:,} chunk_size={args.chunk_size:,} cpu_count={cores}")
+    print(f"{'workers':>8} {'seconds':>9} {'rows/sec':>12} {'speedup':>8} {'efficiency':>10}")
+    base = None
+    for workers in counts:
+        start = time.perf_counter()
+        score_parallel(df, engine, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        speedup = base / elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {args.rows / elapsed:>12,.0f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
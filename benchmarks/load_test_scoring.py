@@ -0,0 +1,100 @@
+# Open-loop load test for the scoring service
+#
+#   uvicorn RiskLens.serving.app:app --port 8000 --no-access-log
+#   python benchmarks/load_test_scoring.py --url http://127.0.0.1:8000 --rate 3000 --seconds 10
+#
+# Requests are issued on a fixed schedule (not when the previous one returns),
+# and latency is measured from the scheduled send time, so a slow server shows
+# up as queueing delay instead of silently lowering the offered load.
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+
+
+def _payloads(n, host, seed):
+    df = RiskProfileGenerator(seed=seed).generate_batch(n)
+    requests = []
+    for record in json.loads(df.to_json(orient="records")):
+        body = json.dumps(record).encode()
+        head = (f"POST /score HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode()
+        requests.append(head + body)
+    return requests
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def run(url, rate, seconds, connections, seed):
+    parsed = urlparse(url)
+    host, port = parsed.hostname, parsed.port or 80
+    payloads = _payloads(1000, f"{host}:{port}", seed)
+    idle = asyncio.Queue()
+    for _ in range(connections):
+        idle.put_nowait(await asyncio.open_connection(host, port))
+
+    latencies, errors = [], 0
+
+    async def one(payload, scheduled):
+        nonlocal errors
+        reader, writer = await idle.get()
+        try:
+            writer.write(payload)
+            status = await _read_response(reader)
+            if status != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - scheduled)
+        finally:
+            idle.put_nowait((reader, writer))
+
+    total = int(rate * seconds)
+    start = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(payloads[i % len(payloads)], scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    while not idle.empty():
+        _, writer = idle.get_nowait()
+        writer.close()
+
+    ms = np.array(latencies) * 1000
+    print(f"offered {rate:,.0f} req/s for {seconds}s over {connections} connections")
+    print(f"completed {len(ms):,} requests in {elapsed:.2f}s ({len(ms) / elapsed:,.0f} req/s), errors={errors}")
+    print("latency ms: " + "  ".join(f"p{q}={np.percentile(ms, q):.2f}" for q in (50, 90, 99, 99.9))
+          + f"  max={ms.max():.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test for POST /score")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rate", type=float, default=2000, help="Requests per second to offer")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.rate, args.seconds, args.connections, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+# Reproducible benchmark suite: scoring, generation, statement parsing, feature stages
+#
+#   PYTHONPATH=. python benchmarks/run_benchmarks.py --output results.json
+#   PYTHONPATH=. python benchmarks/run_benchmarks.py --scale quick --baseline baseline.json --threshold 0.2
+#   PYTHONPATH=. python benchmarks/run_benchmarks.py --results results.json --baseline baseline.json
+#
+# Every case runs in its own child process (fixed seeds, one warm-up, best of
+# --repeat timed runs), so its peak RSS is its own and not the high-water mark
+# of the cases before it. With --baseline the run exits with status 1 when a
+# case's rows/sec falls more than --threshold below the baseline.
+
+import argparse
+import datetime
+import fnmatch
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import pandas as pd
+
+SCALES = {
+    "quick": {"scalar": 2000, "batch": [10000], "generate": [1000, 10000], "statement": [10000],
+              "xlsx": [2000], "transactions": 100000, "repayments": 30000},
+    "full": {"scalar": 20000, "batch": [100000, 1000000], "generate": [1000, 100000, 1000000],
+             "statement": [10000, 100000, 1000000], "xlsx": [10000], "transactions": 1000000, "repayments": 300000},
+}
+
+
+def _label(n):
+    return f"{n // 1000000}M" if n >= 1000000 and n % 1000000 == 0 else f"{n // 1000}k" if n >= 1000 else str(n)
+
+
+# --- Inputs (built outside the timed region) ---
+def _profiles(n):
+    from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+
+    return RiskProfileGenerator(seed=7, as_of="2025-01-01").generate_batch(n)
+
+
+def _statement(n):
+    rng = np.random.default_rng(11)
+    dates = pd.Timestamp("2023-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 730, n)), unit="D")
+    credit = rng.random(n) < 0.2
+    amount = np.round(rng.lognormal(7, 1.2, n), 2)
+    descriptions = np.array(["SALARY ACME CORP", "UPI/PAYMENT/GROCER", "NEFT RENT", "ATM WDL", "EMI HDFC", "POS AMAZON"])
+    return pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Description": descriptions[rng.integers(0, len(descriptions), n)],
+        "Debit": np.where(credit, 0, amount),
+        "Credit": np.where(credit, amount, 0),
+        "Balance": np.round(50000 + np.cumsum(np.where(credit, amount, -amount)), 2),
+    })
+
+
+def _encode_statement(df, fmt):
+    buf = io.BytesIO()
+    if fmt == "csv":
+        df.to_csv(buf, index=False)
+    elif fmt == "xlsx":
+        df.to_excel(buf, index=False)
+    else:
+        df.to_parquet(buf, index=False)
+    return buf.getvalue()
+
+
+def _feature_sources(n_txn, n_repay):
+    rng = np.random.default_rng(5)
+    accounts = max(n_txn // 100, 1)
+    transactions = pd.DataFrame({
+        "account_id": rng.integers(0, accounts, n_txn),
+        "txn_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n_txn), unit="D"),
+        "amount": rng.normal(0, 2000, n_txn),
+        "balance": rng.normal(40000, 8000, n_txn),
+    })
+    installments = 12
+    n_loans = max(n_repay // installments, 1)
+    due = pd.Timestamp("2024-01-05") + pd.to_timedelta(np.tile(np.arange(installments) * 30, n_loans), unit="D")
+    late = rng.integers(-3, 45, len(due))
+    repayments = pd.DataFrame({
+        "account_id": np.repeat(np.arange(n_loans), installments),
+        "due_date": due,
+        "paid_date": (due + pd.to_timedelta(late, unit="D")).where(rng.random(len(due)) > 0.03),
+    })
+    return {"transactions": transactions, "repayments": repayments}
+
+
+# --- Cases ---
+def _cases(scale):
+    """name -> (rows, setup). setup() builds the inputs and returns the function to time."""
+    sizes = SCALES[scale]
+    cases = {}
+
+    def scalar_evaluate():
+        from RiskLens.modeling.risk_engine import RiskEngine
+
+        engine, profiles = RiskEngine(), _profiles(sizes["scalar"]).to_dict("records")
+        return lambda: [engine.evaluate(p) for p in profiles]
+
+    cases["scoring.evaluate"] = (sizes["scalar"], scalar_evaluate)
+
+    for n in sizes["batch"]:
+        def batch(n=n, explain=False):
+            from RiskLens.modeling.risk_engine import RiskEngine
+
+            engine, df = RiskEngine(), _profiles(n)
+            return lambda: engine.evaluate_batch(df, explain=explain)
+
+        cases[f"scoring.evaluate_batch[{_label(n)}]"] = (n, batch)
+        cases[f"scoring.evaluate_batch_explain[{_label(n)}]"] = (n, lambda n=n: batch(n, explain=True))
+
+    for n in sizes["generate"]:
+        def generate(n=n):
+            from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+
+            return lambda: RiskProfileGenerator(seed=7, as_of="2025-01-01").generate_batch(n)
+
+        cases[f"generation.generate_batch[{_label(n)}]"] = (n, generate)
+
+    for fmt, key in (("csv", "statement"), ("parquet", "statement"), ("xlsx", "xlsx")):
+        for n in sizes[key]:
+            def parse(n=n, fmt=fmt):
+                from RiskLens.data_ingestion.bank_statement import parse_bank_statement
+
+                data = _encode_statement(_statement(n), fmt)
+                return lambda: parse_bank_statement(data, filename=f"statement.{fmt}")
+
+            cases[f"statement.parse_{fmt}[{_label(n)}]"] = (n, parse)
+
+    from RiskLens.feature_engineering.pipeline import DEFAULT_STAGES
+
+    for stage in DEFAULT_STAGES:
+        n = sizes[stage.source]
+
+        def feature(stage=stage):
+            from RiskLens.feature_engineering.pipeline import FeatureContext
+
+            frame = _feature_sources(sizes["transactions"], sizes["repayments"])[stage.source][stage.columns]
+            # A fresh context per call: each stage is timed including the sort/grouping it needs.
+            return lambda: stage.compute(FeatureContext(frame, stage.key, stage.order))
+
+        cases[f"features.{stage.name}[{_label(n)}]"] = (n, feature)
+
+    def pipeline():
+        from RiskLens.feature_engineering.pipeline import FeaturePipeline
+
+        sources = _feature_sources(sizes["transactions"], sizes["repayments"])
+        return lambda: FeaturePipeline(workers=1).run(sources)
+
+    cases[f"features.pipeline[{_label(sizes['transactions'])}]"] = (sizes["transactions"], pipeline)
+    return cases
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return (rss if sys.platform == "darwin" else rss * 1024) / 1e6
+
+
+def run_case(name, scale, repeat):
+    rows, setup = _cases(scale)[name]
+    fn = setup()
+    fn()  # warm-up: imports, caches, first-touch allocations
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "rows": rows,
+        "seconds": best,
+        "median_seconds": float(np.median(times)),
+        "rows_per_sec": rows / best if best > 0 else float("inf"),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# --- Results / comparison ---
+def _metadata(scale, repeat):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "scale": scale,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current, baseline, threshold):
+    """Per-case throughput ratio against the baseline; a case regresses below 1 - threshold."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["rows_per_sec"] / base["rows_per_sec"]
+        rows.append({
+            "case": name,
+            "baseline_rows_per_sec": base["rows_per_sec"],
+            "rows_per_sec": result["rows_per_sec"],
+            "ratio": ratio,
+            "status": "REGRESSION" if ratio < 1 - threshold else "ok",
+        })
+    return pd.DataFrame(rows, columns=["case", "baseline_rows_per_sec", "rows_per_sec", "ratio", "status"])
+
+
+def _print_results(results):
+    for name, r in results.items():
+        rss = f"{r['peak_rss_mb']:8.0f} MB" if r["peak_rss_mb"] is not None else ""
+        print(f"{name:<44} {r['seconds']:9.4f}s {r['rows_per_sec']:>14,.0f} rows/sec {rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RiskLens benchmark suite")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="full")
+    parser.add_argument("--only", nargs="+", metavar="PATTERN", help="Glob patterns of case names, e.g. 'scoring.*'")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (the best one is reported)")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--results", help="Compare an existing results file instead of running")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed rows/sec drop (0.2 = 20%%)")
+    parser.add_argument("--in-process", action="store_true", help="Run cases in this process (RSS is cumulative)")
+    parser.add_argument("--list", action="store_true", help="List the case names and exit")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # child-process entry point
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.scale, args.repeat)))
+        return 0
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        names = list(_cases(args.scale))
+        if args.only:
+            names = [n for n in names if any(fnmatch.fnmatch(n, p) for p in args.only)]
+        if args.list:
+            print("\n".join(names))
+            return 0
+        results = {}
+        for name in names:
+            if args.in_process:
+                results[name] = run_case(name, args.scale, args.repeat)
+            else:
+                cmd = [sys.executable, os.path.abspath(__file__), "--case", name,
+                       "--scale", args.scale, "--repeat", str(args.repeat)]
+                proc = subprocess.run(cmd, capture_output=True, text=True)
+                if proc.returncode != 0:
+                    print(proc.stderr, file=sys.stderr)
+                    raise SystemExit(f"benchmark case {name} failed")
+                results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+            _print_results({name: results[name]})
+        current = {"meta": _metadata(args.scale, args.repeat), "results": results}
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("scale") != current.get("meta", {}).get("scale"):
+            print("warning: baseline was recorded at a different --scale", file=sys.stderr)
+        report = compare(current, baseline, args.threshold)
+        print(report.to_string(index=False, float_format=lambda x: f"{x:,.2f}"))
+        if (report["status"] == "REGRESSION").any():
+            print(f"Throughput regressed by more than {args.threshold:.0%} in "
+                  f"{(report['status'] == 'REGRESSION').sum()} case(s)", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,15 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
 import sys
 import os
-import time
 import datetime
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from RiskLens.modeling.risk_engine import RiskEngine
+# Streamlit re-executes this script on every interaction. Only streamlit is
+# imported up front: pandas/numpy come in with the RiskLens modules the
+# cached resources below import, xgboost/lightgbm only when a model is
+# configured, and plotly on the report page.
 
 st.set_page_config(page_title="RiskLens Assessment", layout="wide")
 
@@ -58,26 +57,47 @@ if 'profile' not in st.session_state:
 if 'analysis' not in st.session_state:
     st.session_state.analysis = {}
 
+# --- Cached Resources (built once per server process, shared by all sessions) ---
+@st.cache_resource
+def get_risk_engine():
+    """Heuristic engine with its compiled rule table (rules from RISKLENS_RULES if set)."""
+    from RiskLens.modeling.risk_engine import RiskEngine
+
+    return RiskEngine(rules=os.environ.get("RISKLENS_RULES"))
+
+@st.cache_resource
+def get_statement_cache():
+    """Process-wide parsed-statement cache, so reruns don't re-parse the same upload."""
+    from RiskLens.data_ingestion.statement_cache import StatementCache
+
+    return StatementCache(
+        max_bytes=int(os.environ.get("RISKLENS_STATEMENT_CACHE_MB", 256)) * 1024 * 1024,
+        spill_dir=os.environ.get("RISKLENS_STATEMENT_SPILL_DIR") or None,
+    )
+
+@st.cache_resource
+def get_model_explainer():
+    """Model engine + SHAP explainer loaded once from RISKLENS_MODEL_PATH (None when unset)."""
+    path = os.environ.get("RISKLENS_MODEL_PATH")
+    if not path:
+        return None
+    from RiskLens.modeling.model_engine import ModelRiskEngine
+    from RiskLens.explainability.shap_explain import ShapExplainer
+
+    engine = ModelRiskEngine.load(path, mode=os.environ.get("RISKLENS_MODEL_MODE", "blend"))
+    return engine, ShapExplainer(engine)
+
 # --- Helper Functions ---
 def parse_bank_statement(file):
-    """Parses an Excel bank statement with columns: Date, Description, Debit, Credit, Balance."""
+    """Parses an uploaded bank statement (CSV/Excel/Parquet) with columns: Date, Description, Debit, Credit, Balance."""
+    from RiskLens.data_ingestion.bank_statement import StatementParseError
+
     try:
-        df = pd.read_excel(file)
-        # Normalize headers
-        df.columns = [c.strip().title() for c in df.columns]
-        required_cols = {'Date', 'Description', 'Debit', 'Credit', 'Balance'}
-        
-        if not required_cols.issubset(set(df.columns)):
-            return False, f"Missing columns. Required: {required_cols}", None
-            
-        # Basic data cleaning
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        for col in ['Debit', 'Credit', 'Balance']:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-        return True, "Parsed successfully", df
-    except Exception as e:
-        return False, f"Error reading file: {str(e)}", None
+        parsed = get_statement_cache().get_or_parse(file.getvalue(), file.name)
+    except StatementParseError as e:
+        return False, str(e), None
+    stats = parsed.stats
+    return True, f"Parsed successfully ({stats['rows']:,} rows in {stats['parse_seconds']:.2f}s)", parsed.frame
 
 def validate_inputs(inputs):
     """Checks if mandatory fields are filled."""
@@ -127,14 +147,16 @@ def render_input_screen():
         npa_flag = c2.checkbox("History of NPA / Settlements?")
 
     with tab2:
-        uploaded_files = st.file_uploader("Upload Bank Statements (PDF/Excel)", accept_multiple_files=True)
+        uploaded_files = st.file_uploader("Upload Bank Statements (Excel/CSV/Parquet)", accept_multiple_files=True)
         parsing_status = {}
+        statements = []
         if uploaded_files:
             st.markdown("### Parsing Status")
             for f in uploaded_files:
-                success, msg, _ = parse_bank_statement(f)
+                success, msg, statement_df = parse_bank_statement(f)
                 parsing_status[f.name] = success
                 if success:
+                    statements.append(statement_df)
                     st.success(f"✔ {f.name}: {msg}")
                 else:
                     st.error(f"✘ {f.name}: {msg}")
@@ -184,16 +206,15 @@ def render_input_screen():
             if not is_valid:
                 st.error("Please fill all mandatory fields.")
             else:
-                # Progress Animation
+                # Progress reflects the real stages below (statements were parsed on upload)
                 progress_bar = st.progress(0)
                 status_text = st.empty()
-                
-                steps = ["Validating inputs...", "Parsing bank statements...", "Running risk engine...", "Calculating limits..."]
-                for i, step in enumerate(steps):
+
+                def advance(step, percent):
                     status_text.text(step)
-                    progress_bar.progress((i + 1) * 25)
-                    time.sleep(0.5)
-                
+                    progress_bar.progress(percent)
+
+                advance("Building applicant profile...", 10)
                 # Prepare Profile Data
                 employer_type = (
                     "Govt" if occupation == "Salaried - Govt"
@@ -205,15 +226,10 @@ def render_input_screen():
                     "id_pan": pan,
                     "id_aadhaar": aadhaar,
                     "id_res_status": res_status,
-                    "id_age": (pd.Timestamp.now().date() - dob).days // 365,
+                    "id_age": (datetime.date.today() - dob).days // 365,
                     
                     "fin_declared_income": income,
                     
-                    # Logic: If Bank Stmt is parsed successfully, we check if it matches declared income.
-                    # For this demo, if ANY bank stmt is provided and parsed, we treat it as VERIFIED.
-                    # In a real app, we would sum the credits and compare.
-                    "fin_documented_income_verified": any(parsing_status.values()) if parsing_status else False,
-                    
                     "fin_existing_emi": total_emi,
                     "fin_lti_ratio": (total_emi * 12) / (income + 1),
                     "fin_dependents": dependents,
@@ -233,10 +249,21 @@ def render_input_screen():
                     "prof_geo_risk_score": geo_risk
                 }
                 
-                # Run Engine
-                engine = RiskEngine()
+                # Income verification: recurring statement credits vs declared income
+                advance(f"Verifying income against {len(statements)} bank statement(s)...", 30)
+                from RiskLens.data_ingestion.income_verification import verify_income
+
+                verification = verify_income(statements, income)
+                profile_data.update(verification.to_profile_fields())
+
+                # Run Engine (model-backed when RISKLENS_MODEL_PATH is set); loaded once per process
+                advance("Loading risk engine...", 55)
+                model = get_model_explainer()
+                engine = model[0] if model else get_risk_engine()
+                advance("Scoring and calculating limits...", 80)
                 analysis = engine.evaluate(profile_data)
-                
+                advance("Assessment complete.", 100)
+
                 # Update State
                 st.session_state.profile = profile_data
                 st.session_state.analysis = analysis
@@ -254,6 +281,10 @@ def render_report_screen():
     st.sidebar.markdown("### Applicant ID")
     st.sidebar.info(f"PAN: {st.session_state.profile.get('id_pan')}")
     
+    # Plotting is only needed here, so its import cost is not paid on the input page
+    import plotly.graph_objects as go
+    from RiskLens.explainability.shap_explain import waterfall
+
     # Main Dashboard (Reused Code)
     st.title("Credit Risk Assessment")
     
@@ -341,24 +372,36 @@ def render_report_screen():
     # Panel 4: Risk Drivers Waterfall
     with col4:
         st.subheader("Risk Drivers")
+        model = get_model_explainer()
         drivers = analysis['drivers']
-        if drivers:
+        if model:
+            # TreeSHAP of the model PD (cached per model version + input, so reruns are lookups)
+            steps = waterfall(model[1].explain_profile(profile))
+            factors = [label for label, _, _ in steps]
+            impacts = [value for _, value, _ in steps]
+            measure = [m for _, _, m in steps]
+            text = [f"{x:+.2f}" if m == 'relative' else f"{x:.2f}" for x, m in zip(impacts, measure)]
+            title = "SHAP, log-odds of default (+ = riskier)"
+        elif drivers:
             factors = [d['factor'] for d in drivers]
             impacts = [d['impact'] for d in drivers]
             factors = ['Base Score'] + factors + ['Final Score']
             impacts = [50] + impacts + [0]
             measure = ['absolute'] + ['relative'] * (len(drivers)) + ['total']
-            
+            text = [f"{x:+}" if i > 0 and i < len(impacts)-1 else str(x) for i, x in enumerate(impacts)]
+            title = None
+        if model or drivers:
             fig_waterfall = go.Figure(go.Waterfall(
                 name = "20", orientation = "v",
                 measure = measure,
                 x = factors,
                 textposition = "outside",
-                text = [f"{x:+}" if i > 0 and i < len(impacts)-1 else str(x) for i, x in enumerate(impacts)],
+                text = text,
                 y = impacts,
                 connector = {"line":{"color":"rgb(63, 63, 63)"}},
             ))
             fig_waterfall.update_layout(
+                title=title,
                 height=300,
                 margin=dict(l=20, r=20, t=50, b=20),
                 xaxis=dict(tickfont=dict(size=10))
@@ -382,6 +425,9 @@ def render_report_screen():
         c1.metric("Declared Income", f"₹{profile.get('fin_declared_income', 0):,}")
         c2.metric("Existing EMI", f"₹{profile.get('fin_existing_emi', 0):,}")
         c3.metric("LTI Ratio", f"{profile.get('fin_lti_ratio', 0):.2%}")
+        c1, c2 = st.columns(2)
+        c1.metric("Statement-Verified Income", f"₹{profile.get('fin_verified_income', 0):,}")
+        c2.metric("Verification Confidence", f"{profile.get('fin_income_verification_confidence', 0):.0%}")
 
     with st.expander("Employment & Stability"):
         c1, c2 = st.columns(2)
@@ -395,6 +441,56 @@ def render_report_screen():
         c2.metric("EMI Bounces", profile.get('beh_past_emi_bounces', 0))
         c3.metric("Credit Utilization", f"{profile.get('beh_avg_credit_utilization', 0):.1%}")
 
+    render_sensitivity(profile, go)
+
+# --- What-if Sensitivity ---
+SENSITIVITY_METRICS = {
+    "Risk Score": "risk_score",
+    "Probability of Default": "prob_default",
+    "Recommended Limit": "rec_limit",
+}
+
+def render_sensitivity(profile, go):
+    """Score / PD / limit surface over one or two swept inputs, scored in one vectorized call."""
+    from RiskLens.modeling.sensitivity import SWEEPABLE_FIELDS, sensitivity_grid
+
+    st.markdown("---")
+    st.subheader("What-if Sensitivity")
+    labels = {label: field for field, (label, _) in SWEEPABLE_FIELDS.items()}
+    c1, c2, c3 = st.columns(3)
+    x_label = c1.selectbox("Vary", list(labels), index=0)
+    y_options = ["(none)"] + [label for label in labels if label != x_label]
+    y_label = c2.selectbox("Against", y_options, index=min(2, len(y_options) - 1))
+    metric_label = c3.selectbox("Show", list(SENSITIVITY_METRICS))
+    metric = SENSITIVITY_METRICS[metric_label]
+
+    sweeps = {labels[x_label]: SWEEPABLE_FIELDS[labels[x_label]][1]}
+    if y_label != "(none)":
+        sweeps[labels[y_label]] = SWEEPABLE_FIELDS[labels[y_label]][1]
+    model = get_model_explainer()
+    grid = sensitivity_grid(profile, sweeps, model[0] if model else get_risk_engine())
+
+    x_field = grid.fields[0]
+    if len(grid.fields) == 1:
+        fig = go.Figure(go.Scatter(x=grid.axes[0], y=grid.surface(metric), mode="lines", name=metric_label))
+        fig.add_trace(go.Scatter(x=[profile.get(x_field)], y=[grid.base[metric]], mode="markers",
+                                 marker=dict(color="black", size=12, symbol="x"), name="Current"))
+        fig.update_layout(xaxis_title=x_label, yaxis_title=metric_label)
+    else:
+        y_field = grid.fields[1]
+        fig = go.Figure(go.Heatmap(
+            x=grid.axes[0], y=grid.axes[1], z=grid.surface(metric).T,
+            colorscale="RdYlGn_r" if metric == "prob_default" else "RdYlGn",
+            colorbar=dict(title=metric_label),
+            hovertemplate=f"{x_label}: %{{x}}<br>{y_label}: %{{y}}<br>{metric_label}: %{{z}}<extra></extra>",
+        ))
+        fig.add_trace(go.Scatter(x=[profile.get(x_field)], y=[profile.get(y_field)], mode="markers",
+                                 marker=dict(color="black", size=12, symbol="x"), name="Current"))
+        fig.update_layout(xaxis_title=x_label, yaxis_title=y_label)
+    fig.update_layout(height=450, margin=dict(l=20, r=20, t=30, b=20), showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{grid.results.shape[0]:,} scenarios scored in one batch; x marks the current application.")
+
 # --- Main Router ---
 if st.session_state.page == 'input':
     render_input_screen()
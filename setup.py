@@ -5,19 +5,25 @@ setup(
     version='0.1.0',
     description='Open‑Source Credit‑Risk Analytics with Real‑World, Privacy‑Friendly Signals',
     author='RiskLens Contributors',
-    packages=find_packages(),
+    packages=find_packages(include=['RiskLens', 'RiskLens.*']),
     install_requires=[
         'pandas',
         'numpy',
+        'pyarrow',
+        'openpyxl',
         'scikit-learn',
         'xgboost',
         'lightgbm',
         'shap',
         'streamlit',
+        'uvicorn',
         'matplotlib',
         'seaborn',
         'jupyter',
     ],
     include_package_data=True,
+    entry_points={
+        'console_scripts': ['risklens=RiskLens.cli:main'],
+    },
     python_requires='>=3.7',
 ) 
\ No newline at end of file
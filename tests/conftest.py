@@ -0,0 +1,5 @@
+# Makes `import RiskLens` work when the tests run without installing the package (`pytest tests`)
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from RiskLens.feature_engineering.account_activity import AccountActivityFeatures
+from RiskLens.feature_engineering.grouping import grouped_rolling_std
+
+
+def _transactions(n=4000, accounts=50, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "account_id": rng.choice([f"AC{i:03d}" for i in range(accounts)], n),
+        "txn_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 180 * 24, n), unit="h"),
+        "amount": rng.normal(0, 2000, n),
+        "balance": rng.normal(50000, 8000, n),
+    })
+    return df.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def test_velocity_and_size_match_pandas_reference():
+    df = _transactions()
+    feats = AccountActivityFeatures(df).features()
+
+    day = df["txn_date"].dt.floor("D")
+    last = day.groupby(df["account_id"]).transform("max")
+    expected_7d = (day > last - pd.Timedelta(days=7)).groupby(df["account_id"]).sum()
+    size = df["amount"].abs().groupby(df["account_id"])
+
+    assert feats.index.is_unique and len(feats) == 50
+    assert feats["txn_count_7d"].sort_index().tolist() == expected_7d.sort_index().tolist()
+    np.testing.assert_allclose(feats["median_txn_size"].sort_index(), size.median().sort_index())
+    np.testing.assert_allclose(feats["mean_txn_size"].sort_index(), size.mean().sort_index())
+
+
+def test_balance_volatility_matches_groupby_rolling():
+    df = _transactions()
+    feats = AccountActivityFeatures(df).balance_fluctuation(window=10)
+
+    daily = (
+        df.sort_values(["account_id", "txn_date"], kind="stable")
+        .assign(day=lambda d: d["txn_date"].dt.floor("D"))
+        .groupby(["account_id", "day"])["balance"].last()
+        .reset_index(level="account_id")
+    )
+    # A calendar window: days without transactions do not stretch it.
+    rolling = daily.groupby("account_id")["balance"].rolling("10D", min_periods=2).std()
+    expected = rolling.groupby(level=0).last()
+
+    np.testing.assert_allclose(feats["balance_volatility_10d"].sort_index(), expected.sort_index(), rtol=1e-9)
+
+
+def test_rolling_std_of_stable_group_after_volatile_groups():
+    # Running totals of 1999 volatile accounts must not wipe out the last, stable one.
+    rng = np.random.default_rng(3)
+    groups, rows = 2000, 500
+    sigma = np.r_[np.full(groups - 1, 1e7), 10.0]
+    values = 40000 + rng.normal(0, 1, (groups, rows)) * sigma[:, None]
+    group_ids = np.repeat(np.arange(groups), rows)
+    starts = np.arange(groups) * rows
+
+    vol = grouped_rolling_std(group_ids, starts, values.ravel(), 30)
+
+    expected = pd.Series(values[-1]).rolling(30, min_periods=2).std()
+    np.testing.assert_allclose(vol[-rows:], expected, rtol=1e-6)
+    np.testing.assert_allclose(vol[:rows], pd.Series(values[0]).rolling(30, min_periods=2).std(), rtol=1e-6)
+
+
+def test_single_transaction_account_has_no_volatility():
+    df = pd.DataFrame({
+        "account_id": [1],
+        "txn_date": [pd.Timestamp("2024-03-01")],
+        "amount": [-500.0],
+        "balance": [1000.0],
+    })
+
+    feats = AccountActivityFeatures(df).features()
+
+    assert feats.loc[1, "txn_count_30d"] == 1
+    assert np.isnan(feats.loc[1, "balance_volatility_30d"])
+    assert feats.loc[1, "mean_median_size_ratio"] == pytest.approx(1.0)
+
+
+def test_empty_transactions_give_empty_features():
+    feats = AccountActivityFeatures(_transactions().iloc[:0]).features()
+
+    assert feats.empty
+    assert "balance_volatility_30d" in feats.columns
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from RiskLens.alert_engine.triggers import AccountStateStore, AlertEngine, NewFlag, ScoreDrop, ThresholdCross
+
+
+def _batch(ids, scores, npa, bounces):
+    return pd.DataFrame({"account_id": ids, "risk_score": scores, "ext_previous_npa": npa,
+                         "beh_past_emi_bounces": bounces})
+
+
+def test_triggers_fire_against_previous_state():
+    engine = AlertEngine()
+    first = engine.process(_batch([1, 2, 3, 4], [80, 70, 60, 50], [False, False, True, False], [0, 2, 5, 0]))
+    # New accounts: only the bounce threshold fires (no previous state to drop from).
+    assert first[["account_id", "trigger"]].values.tolist() == [[3, "emi_bounces"]]
+
+    second = engine.process(_batch([1, 2, 3, 5], [65, 69, 60, 40], [False, True, True, False], [1, 3, 6, 0]))
+    fired = set(map(tuple, second[["account_id", "trigger"]].values.tolist()))
+    assert fired == {(1, "score_drop"), (2, "new_npa"), (2, "emi_bounces")}
+    row = second[second["trigger"] == "score_drop"].iloc[0]
+    assert (row["previous"], row["current"]) == (80, 65)
+
+
+def test_only_changed_rows_are_examined_and_last_update_wins():
+    engine = AlertEngine()
+    batch = _batch(np.arange(1000), np.full(1000, 70), False, 0)
+    engine.process(batch)
+    assert engine.rows_changed == 1000
+
+    update = batch.copy()
+    update.loc[10, "risk_score"] = 40
+    alerts = engine.process(pd.concat([update, _batch([10], [70], False, 0)]))
+    assert engine.rows_changed == 1000  # row 10 is back at 70 in its last update: nothing changed
+    assert alerts.empty
+
+    update.loc[10, "risk_score"] = 40
+    alerts = engine.process(update)
+    assert engine.rows_changed == 1001 and alerts["account_id"].tolist() == [10]
+
+
+def test_memmap_store_persists_and_grows(tmp_path):
+    triggers = [ScoreDrop(5), NewFlag(), ThresholdCross(threshold=2)]
+    engine = AlertEngine(triggers, path=str(tmp_path / "state"), id_column="id_pan", id_dtype="S10")
+    pans = [f"ABCDE{i:04d}F" for i in range(300)]
+    engine.process(pd.DataFrame({"id_pan": pans, "risk_score": 70, "ext_previous_npa": False,
+                                 "beh_past_emi_bounces": 0}))
+    engine.flush()
+
+    reopened = AlertEngine(triggers, path=str(tmp_path / "state"), id_column="id_pan")
+    assert len(reopened.store) == 300
+    alerts = reopened.process(pd.DataFrame({"id_pan": pans[:2] + ["ZZZZZ0000Z"], "risk_score": [60, 70, 10],
+                                            "ext_previous_npa": False, "beh_past_emi_bounces": 0}))
+    assert alerts["id_pan"].tolist() == [pans[0].encode()]
+
+
+def test_store_lookup_and_growth():
+    store = AccountStateStore(["risk_score"], capacity=4)
+    slots = store.insert(np.array([50, 10, 30]))
+    store.insert(np.array([20, 40]))
+    assert store.capacity == 8 and len(store) == 5
+    assert store.lookup([10, 20, 30, 40, 50, 60]).tolist() == [1, 3, 2, 4, 0, -1]
+    store.set(slots, np.array([[1.0], [2.0], [3.0]], dtype=np.float32))
+    assert store.get(store.lookup([30]))[0, 0] == 3.0
@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from RiskLens.data_ingestion.bank_statement import StatementParseError, parse_bank_statement
+
+
+def _statement(n=120):
+    dates = pd.date_range("2024-01-01", periods=n, freq="D")
+    return pd.DataFrame({
+        " date ": dates.strftime("%Y-%m-%d"),
+        "DESCRIPTION": ["SALARY ACME" if d.day == 1 else "UPI PAYMENT" for d in dates],
+        "Debit": np.where(dates.day == 1, 0, 250.5),
+        "Credit": np.where(dates.day == 1, 50000, 0),
+        "Balance": np.arange(n, dtype=float) * 10,
+    })
+
+
+def _encode(df, fmt):
+    buf = io.BytesIO()
+    if fmt == "csv":
+        df.to_csv(buf, index=False)
+    elif fmt == "xlsx":
+        df.to_excel(buf, index=False)
+    else:
+        df.to_parquet(buf, index=False)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx", "parquet"])
+def test_formats_parse_to_compact_typed_frame(fmt):
+    source = _statement()
+    parsed = parse_bank_statement(_encode(source, fmt), filename=f"stmt.{fmt}", chunk_size=50)
+    frame = parsed.frame
+
+    assert list(frame.columns) == ["Date", "Description", "Debit", "Credit", "Balance"]
+    assert pd.api.types.is_datetime64_any_dtype(frame["Date"])
+    assert isinstance(frame["Description"].dtype, pd.CategoricalDtype)
+    assert all(frame[c].dtype == np.float32 for c in ["Debit", "Credit", "Balance"])
+    assert len(frame) == 120
+    assert frame["Credit"].sum() == 4 * 50000
+    assert parsed.stats["format"] == fmt
+    assert parsed.stats["chunks"] == 3
+
+
+def test_format_is_sniffed_without_extension():
+    parsed = parse_bank_statement(io.BytesIO(_encode(_statement(10), "parquet")))
+
+    assert parsed.stats["format"] == "parquet"
+    assert parsed.stats["rows"] == 10
+
+
+def test_csv_amount_markers_fall_back_to_zero():
+    data = b'Date,Description,Debit,Credit,Balance\n2024-01-01,x,-,"1,000.50",5\n2024-01-02,y,3,0,2\n'
+
+    frame = parse_bank_statement(data, filename="s.csv").frame
+
+    assert frame["Debit"].tolist() == [0.0, 3.0]
+    assert frame["Credit"].tolist() == [1000.5, 0.0]
+
+
+def test_missing_columns_raise():
+    data = _encode(_statement(5).drop(columns=["Balance"]), "csv")
+
+    with pytest.raises(StatementParseError, match="Missing columns"):
+        parse_bank_statement(data, filename="s.csv")
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.risk_engine import RiskEngine
+
+RESULT_COLUMNS = ["risk_score", "prob_default", "prob_repayment", "rec_limit", "min_limit", "max_limit"]
+
+
+def _scalar_frame(engine, df):
+    rows = [engine.evaluate(profile) for profile in df.to_dict("records")]
+    return pd.DataFrame(rows, index=df.index)[RESULT_COLUMNS]
+
+
+def test_batch_matches_scalar_on_synthetic_portfolio():
+    engine = RiskEngine()
+    df = RiskProfileGenerator(seed=7).generate_batch(2000)
+
+    batch = engine.evaluate_batch(df)
+    scalar = _scalar_frame(engine, df)
+
+    pd.testing.assert_frame_equal(batch, scalar, check_dtype=False)
+
+
+def test_batch_matches_scalar_on_tier_boundaries():
+    engine = RiskEngine()
+    df = pd.DataFrame({
+        "id_res_status": ["Indian", "NRI", "Indian", "Indian", "NRI", "Indian"],
+        "prof_geo_risk_score": ["High", "Low", "Medium", "High", "Low", "Low"],
+        "fin_declared_income": [300000, 299999, 500000, 1000001, 1500000, 2000000],
+        "fin_existing_emi": [0, 30000, 5000, 0, 200000, 1000],
+        "fin_lti_ratio": [0.3, 0.6, 0.61, 0.29, 1.6, 0.0],
+        "fin_documented_income_verified": [True, False, True, False, True, True],
+        "emp_employer_type": ["Govt", "PSU", "Unemployed", "Private", "SME", "MNC"],
+        "ext_cibil_score": [750, 749, 650, 649, 300, 900],
+        "beh_past_emi_bounces": [0, 1, 3, 0, 12, 0],
+        "ext_previous_npa": [False, False, True, False, True, False],
+    })
+
+    batch = engine.evaluate_batch(df)
+    scalar = _scalar_frame(engine, df)
+
+    pd.testing.assert_frame_equal(batch, scalar, check_dtype=False)
+
+
+def test_batch_uses_scalar_defaults_for_missing_columns():
+    engine = RiskEngine()
+    df = pd.DataFrame({"ext_cibil_score": [780, 600]}, index=[10, 20])
+
+    batch = engine.evaluate_batch(df)
+
+    assert list(batch.index) == [10, 20]
+    assert batch.loc[10, "risk_score"] == engine.evaluate({"ext_cibil_score": 780})["risk_score"]
+    assert batch.loc[20, "risk_score"] == engine.evaluate({"ext_cibil_score": 600})["risk_score"]
+    assert np.all(batch["rec_limit"] == 0)
+
+
+def test_driver_matrix_rebuilds_scalar_drivers_on_demand():
+    engine = RiskEngine()
+    df = RiskProfileGenerator(seed=5).generate_batch(300)
+    df.loc[df.index[:5], "beh_past_emi_bounces"] = [1, 2, 3, 0, 7]
+
+    results, matrix = engine.evaluate_batch(df, explain=True)
+
+    assert matrix.impacts.shape == (len(df), len(matrix.factors))
+    assert matrix.impacts.dtype == np.int16
+    assert matrix.nbytes / len(df) < 64
+    for i, profile in enumerate(df.to_dict("records")):
+        assert matrix.drivers(i) == engine.evaluate(profile)["drivers"]
+    assert (matrix.to_frame().sum(axis=1) + 50).clip(0, 100).tolist() == results["risk_score"].tolist()
+
+
+def test_linear_driver_text_quotes_the_raw_input():
+    df = pd.DataFrame({"beh_past_emi_bounces": [1.3, 2.0, 0.0], "ext_cibil_score": 720})
+
+    _, matrix = RiskEngine().evaluate_batch(df, explain=True)
+
+    bounces = [d["desc"] for d in matrix.drivers(0) if d["factor"] == "Payment History"]
+    assert bounces == ["1.3 EMI Bounces"]
+    assert {"factor": "Payment History", "impact": -10, "desc": "2 EMI Bounces"} in matrix.drivers(1)
+    assert all(d["factor"] != "Payment History" for d in matrix.drivers(2))
+
+
+def test_evaluate_without_explain_skips_drivers():
+    engine = RiskEngine()
+    profile = {"ext_cibil_score": 780, "fin_declared_income": 600000}
+
+    result = engine.evaluate(profile, explain=False)
+
+    assert "drivers" not in result
+    assert result["risk_score"] == engine.evaluate(profile)["risk_score"]
@@ -0,0 +1,108 @@
+import json
+
+import pandas as pd
+import pytest
+
+from RiskLens import cli
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.risk_engine import RiskEngine
+from RiskLens.modeling.score_store import ScoreStore
+
+
+@pytest.fixture
+def portfolio(tmp_path):
+    gen = RiskProfileGenerator(seed=9)
+    gen.write_parquet(tmp_path / "in", 2500, chunk_size=500)
+    return tmp_path / "in", pd.read_parquet(tmp_path / "in")
+
+
+def test_score_parquet_matches_batch_scoring(portfolio, tmp_path):
+    src, df = portfolio
+    assert cli.main(["score", str(src), str(tmp_path / "out"), "--explain", "--id-column", "id_pan"]) == 0
+
+    out = pd.read_parquet(tmp_path / "out")
+    expected, matrix = RiskEngine().evaluate_batch(df, explain=True)
+    assert out["row"].tolist() == list(range(len(df)))
+    assert out["id_pan"].tolist() == df["id_pan"].astype(str).tolist()
+    pd.testing.assert_frame_equal(out[expected.columns], expected.reset_index(drop=True))
+    assert (out["impact_loan_to_income"].to_numpy() == matrix.to_frame()["Loan-to-Income"].to_numpy()).all()
+    progress = json.loads((tmp_path / "out" / cli.PROGRESS_FILE).read_text())
+    assert progress["completed_chunks"] == 5 and progress["rows"] == 2500
+
+
+def test_parquet_chunk_size_splits_row_groups(portfolio, tmp_path):
+    src, df = portfolio
+    chunks = list(cli.iter_chunks(str(src), ["ext_cibil_score"], chunk_size=300))
+    resumed = list(cli.iter_chunks(str(src), ["ext_cibil_score"], chunk_size=300, skip=3))
+
+    # Five 500-row files -> 300 + 200 rows each.
+    assert [len(c) for c in chunks] == [300, 200] * 5
+    assert len(resumed) == 7
+    pd.testing.assert_frame_equal(resumed[0], chunks[3])
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df[["ext_cibil_score"]])
+
+    # One file of 128-row groups: chunks span groups, and a resume starts mid-group.
+    df.to_parquet(tmp_path / "small_groups.parquet", index=False, row_group_size=128)
+    chunks = list(cli.iter_chunks(str(tmp_path / "small_groups.parquet"), ["ext_cibil_score"], 300, skip=2))
+    assert [len(c) for c in chunks] == [300] * 6 + [100]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                  df[["ext_cibil_score"]].iloc[600:].reset_index(drop=True))
+
+
+def test_score_csv_in_chunks(portfolio, tmp_path):
+    _, df = portfolio
+    df.to_csv(tmp_path / "in.csv", index=False)
+    assert cli.main(["score", str(tmp_path / "in.csv"), str(tmp_path / "out"), "--chunk-size", "700"]) == 0
+
+    out = pd.read_parquet(tmp_path / "out")
+    assert len(list((tmp_path / "out").glob("part-*.parquet"))) == 4
+    expected = RiskEngine().evaluate_batch(pd.read_csv(tmp_path / "in.csv"))
+    pd.testing.assert_frame_equal(out[expected.columns], expected)
+
+
+@pytest.mark.parametrize("fmt, chunk_args", [("parquet", []), ("parquet", ["--chunk-size", "300"]),
+                                              ("csv", ["--chunk-size", "300"])])
+def test_score_resumes_after_crash(portfolio, tmp_path, monkeypatch, fmt, chunk_args):
+    src, df = portfolio
+    if fmt == "csv":
+        src = tmp_path / "in.csv"
+        df.to_csv(src, index=False)
+    out_dir = tmp_path / "out"
+    write_part = cli._write_part
+    calls = []
+
+    def crash_on_third(path, frame):
+        calls.append(path)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        write_part(path, frame)
+
+    monkeypatch.setattr(cli, "_write_part", crash_on_third)
+    with pytest.raises(KeyboardInterrupt):
+        cli.main(["score", str(src), str(out_dir)] + chunk_args)
+    assert json.loads((out_dir / cli.PROGRESS_FILE).read_text())["completed_chunks"] == 2
+
+    calls.clear()
+    monkeypatch.setattr(cli, "_write_part", write_part)
+    assert cli.main(["score", str(src), str(out_dir), "--resume"] + chunk_args) == 0
+    out = pd.read_parquet(out_dir)
+    pd.testing.assert_frame_equal(
+        out[["row", "risk_score"]],
+        pd.DataFrame({"row": range(len(df)), "risk_score": RiskEngine().evaluate_batch(df)["risk_score"]}),
+    )
+
+    # A checkpoint from a different job is rejected instead of silently mixed in.
+    assert cli.main(["score", str(src), str(out_dir), "--resume", "--explain"] + chunk_args) == 2
+
+
+def test_snapshot_stores_scored_run(portfolio, tmp_path):
+    src, df = portfolio
+    cli.main(["score", str(src), str(tmp_path / "out"), "--explain", "--id-column", "id_pan"])
+    assert cli.main(["snapshot", str(tmp_path / "out"), str(tmp_path / "store"), "--as-of", "2026-01-31"]) == 0
+
+    snap = ScoreStore(str(tmp_path / "store")).as_of("2026-02-01")
+    expected, matrix = RiskEngine().evaluate_batch(df, explain=True)
+    got = snap.get(df["id_pan"].iloc[42])
+    assert got["risk_score"] == expected["risk_score"].iloc[42]
+    assert got["impacts"]["Loan-to-Income"] == matrix.to_frame()["Loan-to-Income"].iloc[42]
+    assert snap.version == RiskEngine().version
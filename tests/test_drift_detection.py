@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from RiskLens import cli
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.explainability.drift_detection import CategorySketch, DriftSketch, HistogramSketch, ks, psi
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+def _scored(seed, n=20000, cibil_shift=0):
+    df = RiskProfileGenerator(seed=seed).generate_batch(n)
+    df["ext_cibil_score"] = np.clip(df["ext_cibil_score"] + cibil_shift, 300, 900)
+    return pd.concat([df, RiskEngine().evaluate_batch(df)], axis=1)
+
+
+def test_worker_sketches_merge_to_the_full_sketch():
+    frame = _scored(1)
+    full = DriftSketch.default().update(frame)
+    parts = [DriftSketch.default().update(frame.iloc[i:i + 5000]) for i in range(0, len(frame), 5000)]
+    merged = parts[0].merge(parts[1]).merge(parts[2]).merge(parts[3])
+
+    assert merged.to_dict() == full.to_dict()
+    assert merged.sketches["risk_score"].n == len(frame)
+    assert DriftSketch.from_dict(full.to_dict()).to_dict() == full.to_dict()
+
+
+def test_compare_flags_shifted_population():
+    reference = DriftSketch.default().update(_scored(1))
+    same = DriftSketch.default().update(_scored(2)).compare(reference).set_index("column")
+    shifted = DriftSketch.default().update(_scored(3, cibil_shift=-120)).compare(reference).set_index("column")
+
+    assert (same["status"] == "stable").all()
+    assert shifted.loc["ext_cibil_score", "status"] == "major"
+    assert shifted.loc["risk_score", "psi"] > same.loc["risk_score", "psi"]
+    assert shifted.loc["ext_cibil_score", "ks"] > 0.3
+    assert np.isnan(shifted.loc["id_res_status", "ks"])
+
+
+def test_sketch_statistics():
+    a = HistogramSketch([1, 2, 3]).update([0.5, 1.5, 1.5, 2.5, np.nan])
+    assert a.counts.tolist() == [1, 2, 1, 0] and a.missing == 1
+    with pytest.raises(ValueError):
+        a.merge(HistogramSketch([1, 2]))
+
+    c = CategorySketch().update(pd.Series([True, False, None, True]))
+    assert c.counts == {"True": 2, "False": 1} and c.missing == 1
+    assert psi(np.array([50, 50]), np.array([50, 50])) == 0
+    assert ks(np.array([100, 0]), np.array([0, 100])) == 1
+
+
+def test_cli_writes_and_compares_sketches(tmp_path, capsys):
+    gen = RiskProfileGenerator(seed=5)
+    gen.write_parquet(tmp_path / "in", 4000, chunk_size=1000)
+    ref = tmp_path / "ref.json"
+
+    assert cli.main(["score", str(tmp_path / "in"), str(tmp_path / "out"), "--drift", str(ref)]) == 0
+    sketch = DriftSketch.load(ref)
+    assert sketch.sketches["risk_score"].n == 4000
+
+    assert cli.main(["drift", str(ref), str(ref)]) == 0
+    assert "risk_score" in capsys.readouterr().out
+
+    shifted = DriftSketch.default().update(_scored(3, n=4000, cibil_shift=-150))
+    shifted.save(tmp_path / "today.json")
+    assert cli.main(["drift", str(ref), str(tmp_path / "today.json"), "--fail-on", "major"]) == 1
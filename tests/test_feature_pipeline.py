@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from RiskLens.feature_engineering import pipeline
+from RiskLens.feature_engineering.account_activity import AccountActivityFeatures
+from RiskLens.feature_engineering.payment_behavior import PaymentBehaviorFeatures
+from RiskLens.feature_engineering.pipeline import FeaturePipeline
+
+
+def _sources(seed=0):
+    rng = np.random.default_rng(seed)
+    n = 3000
+    transactions = pd.DataFrame({
+        "account_id": rng.integers(0, 30, n),
+        "txn_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, n), unit="D"),
+        "amount": rng.normal(0, 1000, n),
+        "balance": rng.normal(20000, 3000, n),
+        "merchant": rng.choice(["a", "b"], n),
+    })
+    due = pd.Timestamp("2024-01-05") + pd.to_timedelta(np.tile(np.arange(3) * 30, 40), unit="D")
+    repayments = pd.DataFrame({
+        "account_id": np.repeat(np.arange(40), 3),
+        "due_date": due,
+        "paid_date": due + pd.to_timedelta(rng.integers(0, 40, 120), unit="D"),
+    })
+    return {"transactions": transactions, "repayments": repayments}
+
+
+def test_pipeline_joins_every_stage_into_one_matrix(tmp_path):
+    sources = _sources()
+    runner = FeaturePipeline(workers=2)
+
+    features = runner.run(sources, output=tmp_path / "features.parquet")
+
+    activity = AccountActivityFeatures(sources["transactions"]).features()
+    payments = PaymentBehaviorFeatures(sources["repayments"])
+    assert len(features) == 40
+    pd.testing.assert_frame_equal(features.loc[activity.index, activity.columns], activity, check_index_type=False)
+    pd.testing.assert_series_equal(
+        features["max_dpd"].astype(int).sort_index(), payments.compute_dpd_buckets()["max_dpd"].sort_index(),
+        check_index_type=False,
+    )
+    assert set(runner.last_report["stage"]) >= {"load:transactions", "transaction_velocity", "payment_consistency"}
+    assert pd.read_parquet(tmp_path / "features.parquet").shape == features.shape
+
+
+def test_stages_in_a_group_share_one_grouped_frame(monkeypatch):
+    built = []
+    real = pipeline.GroupedFrame
+
+    def counting(*args, **kwargs):
+        built.append(args[1:])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "GroupedFrame", counting)
+    FeaturePipeline(workers=1, track_memory=True).run({"transactions": _sources()["transactions"]})
+
+    assert built == [("account_id", "txn_date")]
+
+
+def test_sources_are_pruned_to_declared_columns(tmp_path, monkeypatch):
+    sources = _sources()
+    path = str(tmp_path / "transactions.parquet")
+    sources["transactions"].to_parquet(path)
+    runner = FeaturePipeline(workers=1, track_memory=True)
+    load, loaded = runner._load, {}
+
+    def spy(source, columns):
+        frame = load(source, columns)
+        loaded["frame" if isinstance(source, pd.DataFrame) else "file"] = frame
+        return frame
+
+    monkeypatch.setattr(runner, "_load", spy)
+    runner.run({"transactions": path, "repayments": sources["repayments"]})
+
+    declared = {c for s in runner.stages if s.source == "transactions" for c in s.columns}
+    assert set(loaded["file"].columns) == declared and "merchant" not in loaded["file"].columns
+    assert set(loaded["frame"].columns) == {"account_id", "due_date", "paid_date"}
+    report = runner.last_report
+    assert report.attrs["peak_alloc_bytes"] > 0
+    assert report.loc[report["stage"] == "balance_fluctuation", "peak_alloc_bytes"].iloc[0] > 0
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from RiskLens.data_ingestion.income_verification import verify_income
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+def _statement(monthly_salary, months=12, noise_rows=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    salary = pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=months, freq="MS"),
+        "Description": [f"NEFT/SALARY ACME CORP/{i:06d}" for i in range(months)],
+        "Credit": monthly_salary,
+    })
+    noise = pd.DataFrame({
+        "Date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 30 * months, noise_rows), unit="D"),
+        "Description": rng.choice(["UPI FROM FRIEND", "CASH DEPOSIT", "REFUND"], noise_rows),
+        "Credit": np.where(rng.random(noise_rows) < 0.2, rng.exponential(800, noise_rows), 0.0),
+    })
+    df = pd.concat([salary, noise], ignore_index=True)
+    df["Description"] = df["Description"].astype("category")
+    df["Credit"] = df["Credit"].astype(np.float32)
+    return df
+
+
+def test_recurring_salary_verifies_matching_declaration():
+    result = verify_income(_statement(60000), declared_income=700000)
+
+    assert result.source == "recurring"
+    assert result.recurring_sources == 1
+    assert result.annualized_income == 720000
+    assert result.verified
+    assert 0 < result.confidence <= 1
+
+
+def test_inflated_declaration_is_not_verified():
+    result = verify_income(_statement(30000), declared_income=1500000)
+
+    assert not result.verified
+    assert result.confidence < verify_income(_statement(30000), declared_income=360000).confidence
+
+
+def test_no_statements_means_declared_only():
+    result = verify_income([], declared_income=500000)
+
+    assert not result.verified
+    assert result.to_profile_fields()["fin_documented_income_verified"] is False
+
+
+def test_statement_without_descriptions():
+    salary = pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=12, freq="MS"),
+        "Description": pd.Series([None] * 12, dtype="category"),
+        "Credit": 60000.0,
+    })
+
+    result = verify_income(salary, declared_income=700000)
+
+    assert result.source == "recurring"
+    assert result.annualized_income == 720000
+    assert result.verified
+
+
+def test_verification_feeds_risk_engine():
+    profile = {"fin_declared_income": 700000, "ext_cibil_score": 760}
+    profile.update(verify_income(_statement(60000), 700000).to_profile_fields())
+
+    drivers = RiskEngine().evaluate(profile)["drivers"]
+
+    assert {"factor": "Income Verification", "impact": 10, "desc": "Documented Income"} in drivers
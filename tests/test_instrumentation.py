@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from RiskLens import cli, instrumentation
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_instrumentation_records_nothing():
+    instrumentation.reset()
+    assert not instrumentation.is_enabled()
+    df = RiskProfileGenerator(seed=1).generate_batch(50)
+    RiskEngine().evaluate_batch(df)
+    with instrumentation.stage("x") as s:
+        s.add_rows(5)
+    assert instrumentation.snapshot() == {}
+    assert instrumentation.to_prometheus() == ""
+
+
+def test_stages_count_calls_rows_and_errors(enabled):
+    df = RiskProfileGenerator(seed=1).generate_batch(200)
+    engine = RiskEngine()
+    engine.evaluate_batch(df, explain=True)
+    engine.evaluate(df.iloc[0].to_dict())
+    with pytest.raises(RuntimeError):
+        with instrumentation.stage("custom", rows=3):
+            raise RuntimeError
+
+    stats = instrumentation.snapshot()
+    assert stats["ingestion.generate_profiles"]["rows"] == 200
+    assert stats["modeling.evaluate_batch"]["calls"] == 1 and stats["modeling.evaluate_batch"]["rows"] == 200
+    assert stats["modeling.evaluate"]["rows"] == 1
+    assert stats["custom"]["errors"] == 1 and stats["custom"]["rows"] == 3
+
+    text = instrumentation.to_prometheus()
+    assert "# TYPE risklens_stage_seconds_total counter" in text
+    assert 'risklens_stage_rows_total{stage="modeling.evaluate_batch"} 200' in text
+
+
+def test_sampling_profiler_writes_collapsed_stacks(tmp_path):
+    def busy():
+        total = 0
+        for i in range(3000000):
+            total += i
+        return total
+
+    with instrumentation.profile(tmp_path / "stacks.txt", interval=0.001) as profiler:
+        busy()
+    lines = (tmp_path / "stacks.txt").read_text().splitlines()
+    assert profiler.samples > 0 and lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0 and "busy" in stack.split(";")[-1]
+
+
+def test_cli_score_writes_metrics_and_profile(tmp_path):
+    RiskProfileGenerator(seed=2).write_parquet(tmp_path / "in", 1000, chunk_size=500)
+    try:
+        assert cli.main(["score", str(tmp_path / "in"), str(tmp_path / "out"),
+                         "--metrics", str(tmp_path / "metrics.json"), "--profile", str(tmp_path / "stacks.txt")]) == 0
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    stages = json.loads((tmp_path / "metrics.json").read_text())["stages"]
+    for name in ("cli.read_chunk", "modeling.evaluate_batch", "cli.build_part", "cli.write_part"):
+        assert stages[name]["rows"] == 1000, name
+    assert (tmp_path / "stacks.txt").exists()
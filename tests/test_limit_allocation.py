@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from RiskLens import cli
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.limit_allocation import allocate_limits
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+def _results(pds, caps, floors=None):
+    return pd.DataFrame({
+        "prob_default": pds,
+        "max_limit": caps,
+        "min_limit": floors if floors is not None else np.zeros(len(caps), dtype=np.int64),
+    })
+
+
+def test_exposure_budget_goes_to_best_accounts_first():
+    results = _results([0.01, 0.40, 0.05, 0.10], [1000, 1000, 1000, 1000])
+    allocation = allocate_limits(results, exposure_budget=2500, lgd=0.45, margin=0.12)
+    # 0.40 PD has a negative expected return; the rest fill in PD order, the last one partially.
+    assert allocation.limits.tolist() == [1000, 0, 1000, 500]
+    assert allocation.exposure_price == pytest.approx(0.12 * 0.9 - 0.45 * 0.1)
+    assert allocation.loss_price == 0
+
+
+def test_loss_budget_is_met_exactly_and_prefers_low_pd():
+    results = _results([0.01, 0.05, 0.10], [1000, 1000, 1000])
+    unconstrained = allocate_limits(results, exposure_budget=3000)
+    allocation = allocate_limits(results, exposure_budget=3000, loss_budget=40)
+    assert unconstrained.total_expected_loss > 40
+    assert allocation.total_expected_loss == pytest.approx(40, abs=0.5)
+    assert allocation.limits[0] == 1000 and allocation.limits[1] == 1000 and allocation.limits[2] < 1000
+    assert allocation.loss_price > 0 and allocation.total_expected_return < unconstrained.total_expected_return
+
+
+def test_portfolio_allocation_respects_budgets_and_bounds():
+    df = RiskProfileGenerator(seed=8).generate_batch(20000)
+    results = RiskEngine().evaluate_batch(df)
+    exposure, loss = 0.25 * results["max_limit"].sum(), 0.004 * results["max_limit"].sum()
+    allocation = allocate_limits(results, exposure, loss, floor="min_limit")
+
+    limits = allocation.limits
+    assert limits.index.equals(results.index)
+    assert (limits >= results["min_limit"]).all() and (limits <= results["max_limit"]).all()
+    assert allocation.total_exposure <= exposure and allocation.total_expected_loss <= loss
+    with pytest.raises(ValueError):
+        allocate_limits(results, exposure_budget=1, floor="min_limit")
+
+
+def test_cli_allocate(tmp_path):
+    RiskProfileGenerator(seed=3).write_parquet(tmp_path / "in", 1000, chunk_size=500)
+    cli.main(["score", str(tmp_path / "in"), str(tmp_path / "scores"), "--explain"])
+    budget = pd.read_parquet(tmp_path / "scores")["max_limit"].sum() / 4
+    assert cli.main(["allocate", str(tmp_path / "scores"), str(tmp_path / "limits.parquet"),
+                     "--exposure-budget", str(budget)]) == 0
+    out = pd.read_parquet(tmp_path / "limits.parquet")
+    assert len(out) == 1000 and out["allocated_limit"].sum() <= budget
+    assert not any(c.startswith("impact_") for c in out)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.model_engine import (
+    FEATURE_NAMES,
+    ModelRiskEngine,
+    feature_matrix,
+    feature_vector,
+    synthetic_default_labels,
+    train_model,
+)
+from RiskLens.modeling.risk_engine import RiskEngine, pd_to_score, score_to_pd
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    df = RiskProfileGenerator(seed=21).generate_batch(5000)
+    return df, synthetic_default_labels(df, seed=21)
+
+
+def test_feature_matrix_is_contiguous_float32_and_matches_vector():
+    df = RiskProfileGenerator(seed=2).generate_batch(50)
+    df.loc[3, "fin_existing_emi"] = np.nan
+    X = feature_matrix(df)
+
+    assert X.dtype == np.float32 and X.flags.c_contiguous and X.shape == (50, len(FEATURE_NAMES))
+    for i in (0, 3, 49):
+        record = {k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in df.iloc[i].to_dict().items()}
+        np.testing.assert_array_equal(feature_vector(record)[0], X[i])
+    unknown = feature_vector({"emp_employer_type": "Startup"})
+    assert np.isnan(unknown).all()
+
+
+def test_pd_to_score_inverts_heuristic_mapping():
+    scores = np.arange(0, 81)
+    np.testing.assert_allclose(pd_to_score(score_to_pd(scores)), scores, atol=1e-9)
+    assert pd_to_score(0.01) == 100 and pd_to_score(0.99) == 0
+
+
+@pytest.mark.parametrize("backend", ["xgboost", "lightgbm"])
+def test_model_engine_scalar_batch_parity_and_reload(training_data, backend, tmp_path):
+    df, labels = training_data
+    engine = ModelRiskEngine(train_model(df, labels, backend, num_boost_round=20), mode="blend")
+    sample = df.head(200)
+
+    batch, matrix = engine.evaluate_batch(sample, explain=True)
+    scalar = [engine.evaluate(p) for p in sample.to_dict("records")]
+    pd.testing.assert_frame_equal(pd.DataFrame(scalar).drop(columns="drivers"), batch, check_dtype=False)
+    assert scalar[5]["drivers"] == matrix.drivers(5)
+    assert batch["model_pd"].between(0, 1).all()
+
+    path = tmp_path / ("model.json" if backend == "xgboost" else "model.txt")
+    engine.save(path)
+    reloaded = ModelRiskEngine.load(path, mode="blend")
+    assert reloaded.backend == backend
+    np.testing.assert_allclose(reloaded.evaluate_batch(sample)["model_pd"], batch["model_pd"], rtol=1e-6)
+
+
+def test_blend_weight_zero_reproduces_heuristic(training_data):
+    df, labels = training_data
+    engine = ModelRiskEngine(train_model(df, labels, num_boost_round=5), mode="blend", blend_weight=0.0)
+    sample = df.head(300)
+    pd.testing.assert_frame_equal(engine.evaluate_batch(sample).drop(columns="model_pd"),
+                                  RiskEngine().evaluate_batch(sample))
+    assert engine.version != ModelRiskEngine(engine.booster, mode="blend", blend_weight=0.3).version
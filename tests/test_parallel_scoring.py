@@ -0,0 +1,42 @@
+import pandas as pd
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.parallel import score_parallel
+from RiskLens.modeling.risk_engine import RiskEngine
+
+
+def test_parallel_frame_scoring_preserves_order_and_values():
+    engine = RiskEngine()
+    df = RiskProfileGenerator(seed=3).generate_batch(5000)
+    df.index = df.index[::-1] + 100
+
+    results, matrix = score_parallel(df, engine, workers=2, chunk_size=700, explain=True)
+    expected, expected_matrix = engine.evaluate_batch(df, explain=True)
+
+    pd.testing.assert_frame_equal(results, expected)
+    assert (matrix.impacts == expected_matrix.impacts).all()
+    assert matrix.drivers_for(df.index[10]) == expected_matrix.drivers(10)
+
+
+def test_parallel_object_columns_match_scalar_truthiness():
+    engine = RiskEngine()
+    df = pd.DataFrame({
+        "id_res_status": ["Indian", None, "NRI"] * 10,
+        "fin_documented_income_verified": [True, None, False] * 10,
+        "fin_declared_income": [600000, 250000, None] * 10,
+        "ext_cibil_score": [760, 640, 700] * 10,
+    })
+
+    results = score_parallel(df, engine, workers=2, chunk_size=7)
+
+    pd.testing.assert_frame_equal(results, engine.evaluate_batch(df))
+
+
+def test_parallel_parquet_dataset_scoring(tmp_path):
+    gen = RiskProfileGenerator(seed=4)
+    gen.write_parquet(tmp_path, 3000, chunk_size=1000)
+    df = pd.read_parquet(tmp_path)
+
+    results = score_parallel(str(tmp_path), workers=2)
+
+    pd.testing.assert_frame_equal(results, RiskEngine().evaluate_batch(df))
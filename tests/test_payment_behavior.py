@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from RiskLens.feature_engineering.payment_behavior import DPDState, PaymentBehaviorFeatures
+
+AS_OF = pd.Timestamp("2024-12-31")
+
+
+def _history(accounts=40, months=12, seed=0):
+    rng = np.random.default_rng(seed)
+    due = pd.date_range("2024-01-05", periods=months, freq="MS") + pd.Timedelta(days=4)
+    df = pd.DataFrame({
+        "account_id": np.repeat(np.arange(accounts), months),
+        "due_date": np.tile(due, accounts),
+    })
+    delay = rng.choice([-3, 0, 2, 15, 45, 75, 120], len(df), p=[0.2, 0.4, 0.2, 0.1, 0.04, 0.03, 0.03])
+    df["paid_date"] = df["due_date"] + pd.to_timedelta(delay, unit="D")
+    df.loc[rng.random(len(df)) < 0.05, "paid_date"] = pd.NaT
+    df.loc[df["paid_date"] > AS_OF, "paid_date"] = pd.NaT
+    return df
+
+
+def _daily_events(df, freq="D"):
+    """Repayment events batched per `freq` period; a weekly or monthly batch can
+    hold both the "fell due unpaid" row and the payment of one installment."""
+    late = df["paid_date"].isna() | (df["paid_date"] > df["due_date"])
+    became_due = df.loc[late, ["account_id", "due_date"]].assign(paid_date=pd.NaT, day=lambda d: d["due_date"])
+    paid = df[df["paid_date"].notna()].assign(day=lambda d: d["paid_date"])
+    events = pd.concat([paid, became_due], ignore_index=True)
+    return [(day, g.drop(columns="day")) for day, g in events.groupby(events["day"].dt.to_period(freq))]
+
+
+def test_full_history_buckets_and_consistency():
+    df = pd.DataFrame({
+        "account_id": ["A", "A", "A", "B"],
+        "due_date": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01", "2024-03-01"]),
+        "paid_date": pd.to_datetime(["2024-01-01", "2024-03-15", None, "2024-02-25"]),
+    })
+
+    feats = PaymentBehaviorFeatures(df, as_of="2024-04-10")
+    dpd = feats.compute_dpd_buckets()
+    consistency = feats.payment_consistency()
+
+    assert dpd.loc["A", "current_dpd"] == 40
+    assert dpd.loc["A", "max_dpd"] == 43
+    assert dpd.loc["A", "dpd_bucket"] == "30-59"
+    assert dpd.loc["A", "dpd_30_count"] == 2
+    assert dpd.loc["B", "dpd_bucket"] == "current"
+    assert consistency.loc["A", "mean_payment_delay"] == 21.5
+    assert consistency.loc["B", "mean_payment_delay"] == -5
+
+
+@pytest.mark.parametrize("freq", ["D", "W", "M"])
+def test_incremental_updates_match_full_recompute(tmp_path, freq):
+    df = _history()
+    full = PaymentBehaviorFeatures(df, as_of=AS_OF)
+
+    state = DPDState()
+    days = _daily_events(df, freq)
+    for i, (_, events) in enumerate(days):
+        state.update(events)
+        if i == len(days) // 2:
+            state.save(tmp_path / "state")
+            state = DPDState.load(tmp_path / "state")
+
+    pd.testing.assert_frame_equal(
+        state.dpd_snapshot(AS_OF).sort_index(), full.compute_dpd_buckets().sort_index(), check_index_type=False
+    )
+    pd.testing.assert_frame_equal(
+        state.consistency_snapshot().sort_index(), full.payment_consistency().sort_index(),
+        check_index_type=False, rtol=1e-9,
+    )
+
+
+def test_installment_due_and_paid_in_one_batch_is_settled():
+    events = pd.DataFrame({
+        "account_id": ["A", "A"],
+        "due_date": pd.to_datetime(["2024-03-01", "2024-03-01"]),
+        "paid_date": pd.to_datetime([None, "2024-03-05"]),
+    })
+
+    state = DPDState().update(events)
+
+    assert state.outstanding.empty
+    assert state.dpd_snapshot("2024-06-30").loc["A", "current_dpd"] == 0
@@ -0,0 +1,69 @@
+import copy
+import json
+
+import pandas as pd
+import pytest
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.risk_engine import RiskEngine
+from RiskLens.modeling.rules import DEFAULT_RULES, RuleSet
+
+
+def _stricter_cibil_rules():
+    spec = copy.deepcopy(DEFAULT_RULES)
+    cibil = next(r for r in spec["rules"] if r["feature"] == "ext_cibil_score")
+    cibil["bins"][1]["below"] = 800
+    return spec
+
+
+def test_bins_honour_below_and_upto_edges():
+    rules = RuleSet()
+    income = next(r for r in rules.rules if r.feature == "fin_declared_income")
+
+    values = [299999, 300000, 500000, 500001, 1000000, 1500000, 1500001]
+    expected = [-10, 0, 0, 5, 5, 10, 15]
+
+    assert [int(income.impacts[income.slot_one(v)]) for v in values] == expected
+    assert income.impacts[income.slots(pd.Series(values))].tolist() == expected
+
+
+def test_categorical_columns_use_category_lookup():
+    rules = RuleSet()
+    employer = next(r for r in rules.rules if r.feature == "emp_employer_type")
+    values = pd.Series(["PSU", "MNC", "Unemployed", None], dtype="category")
+
+    assert employer.impacts[employer.slots(values)].tolist() == [10, 0, -20, 0]
+
+
+def test_load_rules_from_file_without_restart(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(_stricter_cibil_rules()))
+    profile = {"ext_cibil_score": 780, "fin_declared_income": 600000}
+
+    engine = RiskEngine()
+    before = engine.evaluate(profile)["risk_score"]
+    old_version = engine.rules.version
+    engine.load_rules(str(path))
+
+    assert engine.evaluate(profile)["risk_score"] == before - 20
+    assert engine.rules.version != old_version
+
+
+def test_custom_rules_keep_scalar_and_batch_in_sync():
+    engine = RiskEngine(_stricter_cibil_rules())
+    df = RiskProfileGenerator(seed=11).generate_batch(500)
+
+    batch = engine.evaluate_batch(df)["risk_score"].tolist()
+    scalar = [engine.evaluate(p)["risk_score"] for p in df.to_dict("records")]
+
+    assert batch == scalar
+
+
+def test_unordered_bin_edges_are_rejected():
+    spec = {"rules": [{
+        "factor": "CIBIL Score", "feature": "ext_cibil_score", "type": "bins",
+        "bins": [{"below": 750, "impact": 0}, {"below": 650, "impact": -20}, {"impact": 20}],
+    }]}
+
+    with pytest.raises(ValueError):
+        RuleSet(spec)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.modeling.risk_engine import RiskEngine
+from RiskLens.modeling.score_store import ScoreStore
+
+
+def _scored(n=500, seed=3):
+    df = RiskProfileGenerator(seed=seed).generate_batch(n)
+    engine = RiskEngine()
+    results, matrix = engine.evaluate_batch(df, explain=True)
+    return df, engine, results, matrix
+
+
+def test_point_lookups_match_scoring_output(tmp_path):
+    df, engine, results, matrix = _scored()
+    store = ScoreStore(str(tmp_path))
+    snap = store.write(df["id_pan"], results, as_of="2026-01-31", version=engine.version, impacts=matrix.to_frame())
+
+    for i in [0, 17, 499]:
+        got = snap.get(df["id_pan"].iloc[i])
+        assert {k: got[k] for k in results.columns} == results.iloc[i].to_dict()
+        assert got["impacts"] == dict(zip(matrix.factors, matrix.impacts[i].tolist()))
+    assert snap.get("NOTAPAN000") is None
+    assert snap.get(df["id_pan"].iloc[0] + "X") is None  # no match on a truncated prefix
+
+    pans = df["id_pan"].iloc[[5, 2, 9]].tolist()
+    frame = snap.lookup(pans + ["MISSING"])
+    assert frame.index.tolist() == pans
+    assert frame["risk_score"].tolist() == results["risk_score"].iloc[[5, 2, 9]].tolist()
+    assert isinstance(snap.columns["risk_score"], np.memmap)
+
+
+def test_as_of_queries_across_runs(tmp_path):
+    store = ScoreStore(str(tmp_path))
+    ids = np.array([30, 10, 20])
+    store.write(ids, pd.DataFrame({"risk_score": [70, 60, 50]}), as_of="2026-01-31", version="v1")
+    store.write(ids[:2], pd.DataFrame({"risk_score": [40, 65]}), as_of="2026-02-28", version="v2")
+
+    reopened = ScoreStore(str(tmp_path))
+    assert reopened.as_of("2026-01-15") is None
+    assert reopened.as_of("2026-02-10").version == "v1"
+    assert reopened.snapshot().as_of == "2026-02-28"
+    assert reopened.score_as_of(30, "2026-02-10")["risk_score"] == 70
+    assert reopened.score_as_of(30, "2026-03-01")["risk_score"] == 40
+    # Account 20 was not rescored in February: its latest score is January's.
+    latest = reopened.score_as_of(20, "2026-03-01")
+    assert (latest["risk_score"], latest["run_id"]) == (50, "run-00001")
+    assert reopened.score_as_of(99, "2026-03-01") is None
+
+
+def test_duplicate_ids_are_rejected(tmp_path):
+    store = ScoreStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.write([1, 1], pd.DataFrame({"risk_score": [1, 2]}))
+    assert store.runs == []
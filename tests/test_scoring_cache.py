@@ -0,0 +1,91 @@
+import copy
+
+import numpy as np
+
+from RiskLens.modeling.cache import ScoringCache
+from RiskLens.modeling.risk_engine import RiskEngine
+from RiskLens.modeling.rules import DEFAULT_RULES
+
+PROFILE = {
+    "id_pan": "ABCDE1234F",
+    "id_res_status": "Indian",
+    "prof_geo_risk_score": 3,
+    "fin_declared_income": 900000,
+    "fin_documented_income_verified": True,
+    "fin_lti_ratio": 0.16,
+    "emp_employer_type": "Private",
+    "ext_cibil_score": 720,
+    "beh_past_emi_bounces": 0,
+    "ext_previous_npa": False,
+    "fin_existing_emi": 12000,
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hits_ignore_irrelevant_fields_and_equivalent_types():
+    cache = ScoringCache()
+    first = cache.evaluate(PROFILE)
+    resubmitted = dict(PROFILE, id_pan="ZZZZZ9999Z", ext_cibil_score=np.int64(720), fin_declared_income=900000.0)
+
+    assert cache.evaluate(resubmitted) == first == RiskEngine().evaluate(PROFILE)
+    assert cache.evaluate(dict(PROFILE, ext_cibil_score=721)) == RiskEngine().evaluate(dict(PROFILE, ext_cibil_score=721))
+    assert "drivers" not in cache.evaluate(PROFILE, explain=False)
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    # Results are copies: a caller mutating one cannot poison the cache.
+    first["drivers"].clear()
+    assert cache.evaluate(PROFILE)["drivers"]
+
+
+def test_absent_none_and_nan_inputs_do_not_share_entries():
+    # An absent field takes the rule default, None and NaN do not (and NaN is truthy for flags).
+    cache = ScoringCache()
+    engine = RiskEngine()
+    absent = {k: v for k, v in PROFILE.items() if k not in ("ext_cibil_score", "ext_previous_npa")}
+    for cibil in ("absent", None, float("nan")):
+        for npa in ("absent", None, np.nan):
+            profile = dict(absent)
+            if cibil != "absent":
+                profile["ext_cibil_score"] = cibil
+            if npa != "absent":
+                profile["ext_previous_npa"] = npa
+            assert cache.evaluate(profile) == engine.evaluate(profile)
+    assert cache.misses == 9 and cache.hits == 0
+
+
+def test_lru_eviction_and_ttl_expiry():
+    clock = FakeClock()
+    cache = ScoringCache(max_entries=2, ttl_seconds=10, clock=clock)
+    for score in (700, 710, 720):
+        cache.evaluate(dict(PROFILE, ext_cibil_score=score))
+    assert len(cache) == 2 and cache.evictions == 1
+
+    cache.evaluate(dict(PROFILE, ext_cibil_score=720))
+    assert cache.hits == 1
+    clock.now = 11
+    cache.evaluate(dict(PROFILE, ext_cibil_score=720))
+    assert cache.expirations == 1 and cache.stats()["misses"] == 4
+
+
+def test_rule_change_invalidates_cache():
+    engine = RiskEngine()
+    cache = ScoringCache(engine)
+    before = cache.evaluate(PROFILE)
+    key = cache.key(PROFILE)
+
+    rules = copy.deepcopy(DEFAULT_RULES)
+    rules["base_score"] -= 10
+    engine.load_rules(rules)
+    after = cache.evaluate(PROFILE)
+
+    assert cache.key(PROFILE) != key
+    assert cache.invalidations == 1 and cache.misses == 2
+    assert after == RiskEngine(rules).evaluate(PROFILE)
+    assert after["risk_score"] == before["risk_score"] - 10
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from RiskLens.modeling.risk_engine import RiskEngine
+from RiskLens.modeling.sensitivity import sensitivity_grid
+
+PROFILE = {
+    "id_res_status": "Indian",
+    "fin_declared_income": 900000,
+    "fin_existing_emi": 12000,
+    "fin_lti_ratio": 12000 * 12 / 900001,
+    "emp_employer_type": "Private",
+    "ext_cibil_score": 720,
+    "ext_previous_npa": False,
+    "beh_past_emi_bounces": 0,
+    "prof_geo_risk_score": "Medium",
+    "fin_documented_income_verified": True,
+}
+
+
+def test_grid_matches_evaluate_at_every_point():
+    engine = RiskEngine()
+    cibil, emi = np.arange(300, 901, 50), np.arange(0, 60001, 7500)
+    grid = sensitivity_grid(PROFILE, {"ext_cibil_score": cibil, "fin_existing_emi": emi}, engine)
+
+    assert grid.shape == (len(cibil), len(emi))
+    for i, c in enumerate(cibil):
+        for j, e in enumerate(emi):
+            # The loan-to-income ratio follows the swept EMI.
+            point = dict(PROFILE, ext_cibil_score=c, fin_existing_emi=e, fin_lti_ratio=e * 12 / 900001)
+            expected = engine.evaluate(point, explain=False)
+            for metric in ("risk_score", "prob_default", "rec_limit", "max_limit"):
+                assert grid.surface(metric)[i, j] == expected[metric]
+    assert grid.base == engine.evaluate(PROFILE, explain=False)
+
+
+def test_one_field_sweep_and_long_frame():
+    grid = sensitivity_grid(PROFILE, {"beh_past_emi_bounces": range(4)})
+    assert grid.surface().tolist() == [80, 75, 70, 65]
+    frame = grid.to_frame()
+    assert frame["beh_past_emi_bounces"].tolist() == [0, 1, 2, 3] and "rec_limit" in frame
+
+
+def test_rejects_more_than_two_fields():
+    with pytest.raises(ValueError):
+        sensitivity_grid(PROFILE, {"ext_cibil_score": [700], "fin_existing_emi": [0], "beh_past_emi_bounces": [0]})
@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import pytest
+
+from RiskLens.modeling.risk_engine import RiskEngine
+from RiskLens.serving.app import create_app
+
+DASHBOARD_PROFILE = {
+    "id_pan": "ABCDE1234F",
+    "id_aadhaar": "123412341234",
+    "id_res_status": "Indian",
+    "id_age": 34,
+    "fin_declared_income": 900000,
+    "fin_existing_emi": 12000,
+    "fin_lti_ratio": 12000 * 12 / 900001,
+    "fin_dependents": 2,
+    "emp_occupation": "Salaried - Private",
+    "emp_employer_type": "Private",
+    "emp_tenure_years": 4.5,
+    "ext_cibil_score": 720,
+    "ext_open_credit_accounts": 2,
+    "ext_previous_npa": False,
+    "beh_past_emi_bounces": 0,
+    "beh_avg_credit_utilization": 0.3,
+    "asset_collateral_value": 0,
+    "prof_geo_risk_score": 3,
+    "fin_documented_income_verified": True,
+    "fin_verified_income": 880000.0,
+    "fin_income_verification_confidence": 0.8,
+}
+
+
+def _variants(n):
+    profiles = []
+    for i in range(n):
+        p = dict(DASHBOARD_PROFILE, ext_cibil_score=550 + 7 * i, fin_existing_emi=2500 * (i % 9),
+                 id_res_status=["Indian", "NRI", "Foreign National"][i % 3], ext_previous_npa=i % 11 == 0)
+        if i % 5 == 0:
+            del p["fin_existing_emi"]
+        if i % 7 == 0:
+            del p["ext_cibil_score"]
+        if i % 4 == 1:
+            del p["fin_lti_ratio"]
+        profiles.append(p)
+    return profiles
+
+
+async def _request(app, method, path, body=b""):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.mark.parametrize("min_vector_batch", [1, 1024])
+def test_concurrent_requests_are_batched_and_match_evaluate(min_vector_batch):
+    engine = RiskEngine()
+    profiles = _variants(60)
+
+    async def run():
+        app = create_app(engine, max_wait_ms=5, min_vector_batch=min_vector_batch)
+        await app.startup()
+        try:
+            responses = await asyncio.gather(*[
+                _request(app, "POST", "/score", json.dumps(p).encode()) for p in profiles
+            ])
+            health = await _request(app, "GET", "/health")
+        finally:
+            await app.shutdown()
+        return responses, health
+
+    responses, (status, health) = asyncio.run(run())
+    assert all(code == 200 for code, _ in responses)
+    assert [body for _, body in responses] == [engine.evaluate(p) for p in profiles]
+    assert status == 200 and health["requests"] == 60 and health["batches"] < 60
+    assert health["rules_version"] == engine.rules.version
+
+
+def test_bad_requests_are_rejected():
+    async def run():
+        app = create_app(RiskEngine())
+        await app.startup()
+        try:
+            return [
+                await _request(app, "POST", "/score", b"not json"),
+                await _request(app, "POST", "/score", b"[1, 2]"),
+                await _request(app, "GET", "/score"),
+                await _request(app, "GET", "/nope"),
+                await _request(app, "POST", "/score", json.dumps({"fin_declared_income": "lots"}).encode()),
+            ]
+        finally:
+            await app.shutdown()
+
+    assert [status for status, _ in asyncio.run(run())] == [400, 400, 405, 404, 422]
+
+
+def test_requests_before_startup_are_unavailable():
+    async def run():
+        app = create_app(RiskEngine())
+        return [
+            await _request(app, "GET", "/health"),
+            await _request(app, "POST", "/score", json.dumps(DASHBOARD_PROFILE).encode()),
+        ]
+
+    assert [status for status, _ in asyncio.run(run())] == [503, 503]
+
+
+def test_lifespan_loads_engine_once():
+    async def run():
+        app = create_app()
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+            if message["type"] == "lifespan.startup.complete":
+                status, body = await _request(app, "POST", "/score", json.dumps(DASHBOARD_PROFILE).encode())
+                sent.append((status, body["risk_score"]))
+
+        await app({"type": "lifespan"}, receive, send)
+        return app, sent
+
+    app, sent = asyncio.run(run())
+    expected = RiskEngine().evaluate(DASHBOARD_PROFILE)["risk_score"]
+    assert sent == ["lifespan.startup.complete", (200, expected), "lifespan.shutdown.complete"]
+    assert isinstance(app.engine, RiskEngine)
+
+
+def test_metrics_endpoint_exports_prometheus_text():
+    from RiskLens import instrumentation
+
+    async def run():
+        app = create_app(RiskEngine())  # a single request is scored on the scalar path
+        await app.startup()
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        try:
+            await _request(app, "POST", "/score", json.dumps(DASHBOARD_PROFILE).encode())
+            await app({"type": "http", "method": "GET", "path": "/metrics"}, receive, send)
+        finally:
+            await app.shutdown()
+        return sent
+
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        start, body = asyncio.run(run())
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+    assert start["status"] == 200 and dict(start["headers"])[b"content-type"].startswith(b"text/plain")
+    assert 'risklens_stage_calls_total{stage="modeling.evaluate"} 1' in body["body"].decode()
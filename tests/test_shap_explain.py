@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from RiskLens.data_ingestion.synthetic_data import RiskProfileGenerator
+from RiskLens.explainability.shap_explain import BIAS, ShapExplainer, waterfall
+from RiskLens.modeling.model_engine import ModelRiskEngine, synthetic_default_labels, train_model
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    df = RiskProfileGenerator(seed=31).generate_batch(3000)
+    return df, synthetic_default_labels(df, seed=31)
+
+
+@pytest.mark.parametrize("backend", ["xgboost", "lightgbm"])
+def test_contributions_sum_to_model_log_odds(portfolio, backend):
+    df, labels = portfolio
+    engine = ModelRiskEngine(train_model(df, labels, backend, num_boost_round=15))
+    shap = ShapExplainer(engine).explain_frame(df.head(500))
+
+    model_pd = engine.evaluate_batch(df.head(500))["model_pd"].to_numpy()
+    np.testing.assert_allclose(shap.sum(axis=1), np.log(model_pd / (1 - model_pd)), atol=1e-4)
+    assert shap.index.equals(df.head(500).index)
+
+
+def test_explanations_are_cached_per_model_version_and_input(portfolio):
+    df, labels = portfolio
+    engine = ModelRiskEngine(train_model(df, labels, num_boost_round=10))
+    explainer = ShapExplainer(engine)
+    profile = df.iloc[7].to_dict()
+
+    first = explainer.explain_profile(profile)
+    again = explainer.explain_profile(dict(profile))
+    assert (explainer.hits, explainer.misses) == (1, 1)
+    assert first.equals(again)
+
+    explainer.explain_profile(dict(profile, ext_cibil_score=300))
+    retrained = ModelRiskEngine(train_model(df, labels, num_boost_round=11))
+    explainer.engine = retrained
+    explainer.explain_profile(profile)
+    assert explainer.misses == 3 and len(explainer) == 3
+
+
+def test_waterfall_steps_add_up(portfolio):
+    df, labels = portfolio
+    explainer = ShapExplainer(ModelRiskEngine(train_model(df, labels, num_boost_round=10)))
+    contributions = explainer.explain_profile(df.iloc[0].to_dict())
+
+    steps = waterfall(contributions, top_n=5)
+    assert steps[0] == ("Base (log-odds)", pytest.approx(float(contributions[BIAS])), "absolute")
+    assert [m for _, _, m in steps] == ["absolute"] + ["relative"] * 6 + ["total"]
+    assert sum(v for _, v, m in steps if m != "total") == pytest.approx(steps[-1][1], abs=1e-5)
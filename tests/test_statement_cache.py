@@ -0,0 +1,84 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from RiskLens.data_ingestion import statement_cache
+from RiskLens.data_ingestion.statement_cache import StatementCache
+
+
+def _csv(n, credit=1000.0):
+    df = pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=n, freq="D").strftime("%Y-%m-%d"),
+        "Description": ["NEFT"] * n,
+        "Debit": [0.0] * n,
+        "Credit": [credit] * n,
+        "Balance": [1.0] * n,
+    })
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    real = statement_cache.parse_bank_statement
+
+    def counting(data, filename=None):
+        calls.append(filename)
+        return real(data, filename=filename)
+
+    monkeypatch.setattr(statement_cache, "parse_bank_statement", counting)
+    return calls
+
+
+def test_same_content_is_parsed_once(monkeypatch):
+    calls = _count_parses(monkeypatch)
+    cache = StatementCache()
+    data = _csv(30)
+
+    first = cache.get_or_parse(data, "a.csv")
+    second = cache.get_or_parse(io.BytesIO(data), "renamed.csv")
+
+    assert second is first
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_eviction_respects_byte_budget():
+    cache = StatementCache(max_bytes=1)
+    first, second = _csv(10, 1.0), _csv(10, 2.0)
+
+    cache.get_or_parse(first, "a.csv")
+    cache.get_or_parse(second, "b.csv")
+
+    assert len(cache) == 1
+    assert cache.evictions == 1
+    assert statement_cache.content_key(second) in cache
+
+
+def test_evicted_statements_reload_from_parquet_spill(tmp_path, monkeypatch):
+    calls = _count_parses(monkeypatch)
+    cache = StatementCache(max_bytes=1, spill_dir=str(tmp_path))
+    first, second = _csv(10, 1.0), _csv(10, 2.0)
+
+    original = cache.get_or_parse(first, "a.csv").frame
+    cache.get_or_parse(second, "b.csv")
+    reloaded = cache.get_or_parse(first, "a.csv")
+
+    assert len(calls) == 2
+    assert cache.spill_hits == 1
+    pd.testing.assert_frame_equal(reloaded.frame, original)
+    assert reloaded.stats["rows"] == 10
+
+
+def test_counters_add_up_under_concurrent_use():
+    cache = StatementCache()
+    statements = [_csv(5, float(i)) for i in range(4)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cache.get_or_parse(statements[i % 4], f"{i}.csv"), range(400)))
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] + stats["spill_hits"] == 400
+    assert stats["misses"] >= 4